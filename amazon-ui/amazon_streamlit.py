@@ -2,6 +2,17 @@ import streamlit as st
 import requests
 import pandas as pd
 import re
+import json
+
+# FastAPI sunucusunun adresi
+API_URL = "http://127.0.0.1:4000"
+
+# Analiz aşamalarının kullanıcıya gösterilecek karşılıkları
+STAGE_MESSAGES = {
+    "fetching_and_classifying": "Yorumlar çekiliyor ve sınıflandırılıyor...",
+    "grouping": "Yorumlar kategorilere göre gruplanıyor...",
+    "summarizing": "Yorumlar özetleniyor...",
+}
 
 # Sayfa Yapılandırması
 st.set_page_config(page_title="Amazon Ürün Yorum Analizi", layout="centered")
@@ -72,26 +83,63 @@ def link_input_page():
             st.error("Lütfen bir Amazon ürün linki girin.")
             return
 
-        # API isteği gönderme
-        url = "http://127.0.0.1:4000/predict/"
-        data = {"link": link}
-
+        # Analizi başlatma; aşamalar ve özet parçaları üretildikçe ekrana yansıtılır
         try:
-            with st.spinner("Analiz ediliyor, lütfen bekleyin..."):
-                response = requests.post(url, json=data)
-                result = response.json()
-
-                if response.status_code != 200:
-                    st.error("API'den geçerli bir yanıt alınamadı.")
+            response = requests.post(f"{API_URL}/predict/stream", json={"link": link}, stream=True, timeout=(10, 600))
+            if response.status_code != 200:
+                st.error("API'den geçerli bir yanıt alınamadı.")
+                return
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                st.error(response.json().get("message", "Analiz başlatılamadı."))
+                return
+
+            status_text = st.empty()
+            summary_area = st.empty()
+            result = {"conclusion": "", "categories": {}}
+            summary_text = ""
+            completed = False
+            for event, data in read_sse_events(response):
+                if event == "stage":
+                    status_text.info(STAGE_MESSAGES.get(data, "Analiz ediliyor..."))
+                elif event == "categories":
+                    result["categories"] = data
+                elif event == "token":
+                    summary_text += data
+                    summary_area.markdown(summary_text)
+                elif event == "done":
+                    result["conclusion"] = data["conclusion"]
+                    completed = True
+                elif event == "error":
+                    status_text.empty()
+                    st.error(data["message"])
                     return
+            status_text.empty()
+            if not completed:
+                # Akış "done" olayı gelmeden kapandıysa yarım özet kaydedilmez
+                st.error("Analiz tamamlanamadı. Lütfen tekrar deneyin.")
+                return
 
-                # API yanıtını session state'e kaydetme
-                st.session_state["api_response"] = result
-                st.success("Analiz tamamlandı! Sol taraftaki menüden 'Sonuçlar' sayfasına geçebilirsiniz.")
+            # API yanıtını session state'e kaydetme
+            st.session_state["api_response"] = result
+            st.success("Analiz tamamlandı! Sol taraftaki menüden 'Sonuçlar' sayfasına geçebilirsiniz.")
 
         except Exception as e:
             st.error(f"Bir hata oluştu: {e}")
 
+def read_sse_events(response):
+    # Server-Sent-Events akışını (olay, veri) çiftlerine ayırır
+    event = "message"
+    data_lines = []
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+        elif not line and data_lines:
+            yield event, json.loads("\n".join(data_lines))
+            event = "message"
+            data_lines = []
+
 def results_page():
     # Sayfa Başlığı
     st.title("Amazon Ürün Yorum Analizi - Sonuçlar")
@@ -1,7 +1,12 @@
 import os
 import re
-from fastapi import FastAPI
-from pydantic import BaseModel
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 import sys
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,19 +15,150 @@ sys.path.append(src_path)
 
 from classification import ReviewClassifier
 from amazon_api import AmazonAPI
+from review_store import ReviewStore
 from summarization import ReviewSummarizer
+from batch_scheduler import DynamicBatcher
+from job_manager import JobManager, JobQueueFullError
+from model_loading import get_memory_usage, report_memory_usage
+from metrics import COALESCED_REQUESTS, REVIEWS_PROCESSED, render_metrics, stage_timer
+from profiling import RequestProfile, current_profile
+from single_flight import SingleFlight
+from incremental_analysis import IncrementalAnalyzer
+from dedup import ReviewDeduplicator, dedup_enabled, label_review, weighted_category_counts
 
-app = FastAPI()
 model_checkpoint_path = os.path.abspath("src/models/finetuned_class_model")
-amazon_api = AmazonAPI()
-classifier = ReviewClassifier(model_checkpoint_path)
-summarizer = ReviewSummarizer()
+
+# Bileşenler uygulama açılışında (lifespan) oluşturulur; sınıflandırma modeli arka planda yüklenir.
+amazon_api = None
+classifier = None
+batcher = None
+summarizer = None
+incremental_analyzer = None
+job_manager = None
+model_ready = threading.Event()
+warm_up_error = None
+# Aynı ASIN için eşzamanlı analizler tek bir çalıştırmada birleştirilir
+predict_flight = SingleFlight()
+
+
+def warm_up_models() -> None:
+    """
+    Sınıflandırma modelini yükler, örnek bir yorumla ısıtır ve Ollama modelini belleğe alır.
+    Tamamlandığında model_ready işaretlenir.
+    """
+    global classifier, batcher, warm_up_error
+    try:
+        classifier = ReviewClassifier(model_checkpoint_path)
+        classifier.predict_probabilities(["Ürün çok güzel, kargo hızlı geldi."])
+        # Eşzamanlı isteklerin yorumları ortak ileri geçişlerde toplanır
+        batcher = DynamicBatcher(classifier)
+        model_ready.set()
+        print("Sınıflandırma modeli hazır.")
+        # Worker başına bellek; CLASSIFIER_LOAD_MODE=mmap ile ağırlıklar paylaşılan dosya kısmında görünür
+        report_memory_usage()
+    except Exception as e:
+        warm_up_error = str(e)
+        print(f"Model yüklenirken bir hata oluştu: {warm_up_error}")
+        return
+
+    summarizer.client.preload()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global amazon_api, summarizer, incremental_analyzer, job_manager
+    amazon_api = AmazonAPI(review_store=ReviewStore())
+    summarizer = ReviewSummarizer()
+    incremental_analyzer = IncrementalAnalyzer(amazon_api, summarizer)
+    # Uzun analizler için arka plan işçileri (JOB_WORKERS, JOB_QUEUE_SIZE)
+    job_manager = JobManager()
+    threading.Thread(target=warm_up_models, name="model-warm-up", daemon=True).start()
+    yield
+    if batcher is not None:
+        batcher.shutdown()
+    if classifier is not None:
+        classifier.save_cache()
+    summarizer.save_cache()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def require_model() -> None:
+    """
+    Model henüz hazır değilse 503 döner.
+    """
+    if not model_ready.is_set():
+        raise HTTPException(status_code=503, detail="Sınıflandırma modeli henüz hazır değil. Lütfen biraz sonra tekrar deneyin.")
+
+
+@app.get("/health")
+def health():
+    """
+    Canlılık kontrolü: süreç ayaktaysa model yüklenmemiş olsa bile hemen yanıt verir.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    """
+    Hazırlık kontrolü: model yüklenip ısıtılana kadar 503 döner. Hazır olduğunda worker'ın bellek kullanımını da döner.
+    """
+    if model_ready.is_set():
+        return {"status": "ready", "pid": os.getpid(), "memory": get_memory_usage()}
+    if warm_up_error:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": warm_up_error})
+    return JSONResponse(status_code=503, content={"status": "not ready"})
+
+
+@app.get("/metrics")
+def metrics():
+    """
+    Aşama süreleri ve sayaçları Prometheus metin biçiminde döner.
+    """
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
 
 class TextRequest(BaseModel):
     link: str
+    # Yorum bütçesi: verilmezse REVIEW_BUDGET_MAX_REVIEWS ortam değişkeni, o da yoksa tüm yorumlar kullanılır
+    max_reviews: int = Field(None, ge=1)
+    max_pages: int = Field(None, ge=1)
+    strategy: str = None
+
+
+REVIEW_STRATEGIES = ("top", "stratified", "recent")
+
+
+def review_budget(max_reviews: int = None, max_pages: int = None, strategy: str = None) -> dict:
+    """
+    İstekteki yorum bütçesini ortam değişkenlerindeki varsayılanlarla birleştirir.
+
+    Args:
+        max_reviews (int): En fazla yorum sayısı. Verilmezse REVIEW_BUDGET_MAX_REVIEWS kullanılır.
+        max_pages (int): En fazla sayfa sayısı.
+        strategy (str): Örnekleme yöntemi (top, stratified, recent). Verilmezse REVIEW_BUDGET_STRATEGY,
+            o da yoksa "top" kullanılır.
+
+    Returns:
+        dict: max_reviews, max_pages ve strategy alanları; bütçe yoksa None.
+    """
+    strategy = strategy or os.getenv("REVIEW_BUDGET_STRATEGY", "top")
+    if strategy not in REVIEW_STRATEGIES:
+        raise HTTPException(status_code=422,
+                            detail=f"Geçersiz strateji: {strategy}. Geçerli değerler: {', '.join(REVIEW_STRATEGIES)}.")
+    if max_reviews is None and os.getenv("REVIEW_BUDGET_MAX_REVIEWS"):
+        max_reviews = int(os.getenv("REVIEW_BUDGET_MAX_REVIEWS"))
+    if max_reviews is None and max_pages is None:
+        return None
+    return {"max_reviews": max_reviews, "max_pages": max_pages, "strategy": strategy}
+
 
 def get_asin_from_link(link) -> dict:
-    asin_match = re.search(r"/dp/([A-Z0-9]{10})|rd_i=([A-Z0-9]{10})", link, re.IGNORECASE)
+    with stage_timer("asin_extraction"):
+        asin_match = re.search(r"/dp/([A-Z0-9]{10})|rd_i=([A-Z0-9]{10})", link, re.IGNORECASE)
     if asin_match:
         asin_code_1 = asin_match.group(1)
         asin_code_2 = asin_match.group(2)
@@ -33,52 +169,398 @@ def get_asin_from_link(link) -> dict:
         return {"message":'Geçerli bir ASIN numarası bulunamadı.'}
 
 
-@app.post("/classify")
-def classify(link):
-    asin = get_asin_from_link(link)
+def fetch_and_classify(asin: str, budget: dict = None, stats: dict = None, expand_duplicates: bool = False) -> list:
+    """
+    Yorumları sayfa sayfa çeker ve sayfalar indikçe mikro-batch'ler halinde sınıflandırır.
 
-    # 1. Amazon yorumlarını çekme
-    reviews = amazon_api.get_amazon_reviews(asin)
-    if not reviews:
-        return {"message": "Yorumlar alınamadı. İşlem sonlandırıldı."}
+    Yakın kopya yorumlar (REVIEW_DEDUP=0 ile kapatılabilir) sınıflandırmadan önce kümelenir; her kümeden
+    yalnızca ilk yorum sınıflandırılır ve sonucunda kümedeki yorum sayısı "count" alanında döner.
 
-    # 2. Yorumları sınıflandırma
-    print("Yorumlar sınıflandırılıyor...")
-    classified_reviews = classifier.classify_reviews(reviews, threshold=0.5)
+    Args:
+        asin (str): Ürüne ait ASIN kodu.
+        budget (dict): Yorum bütçesi (max_reviews, max_pages, strategy); verilmezse tüm yorumlar çekilir.
+        stats (dict): Verilirse total_reviews, sampled_reviews ve unique_reviews alanlarıyla doldurulur.
+        expand_duplicates (bool): True ise temsilcilerin sonuçları kümelerindeki her yoruma uygulanır ve
+            her yorum ayrı bir sonuç olarak döner ("count" alanı eklenmez).
 
-    if not classified_reviews:
-        return {"message": 'Sınıflandırma sonuçları alınamadı. İşlem sonlandırıldı.'}
-    return {"classified_reviews": classified_reviews}
+    Returns:
+        list: Sınıflandırılmış yorumlar. Yorum alınamazsa boş liste döner.
+    """
+    stats = stats if stats is not None else {}
+    review_pages = amazon_api.iter_amazon_reviews(asin, stats=stats, **(budget or {}))
+    deduplicator = ReviewDeduplicator() if dedup_enabled() else None
+    if deduplicator is not None:
+        review_pages = deduplicator.dedupe_stream(review_pages)
+    # Profil istenen isteklerde tokenizasyon ve ileri geçiş isteğin kendi iş parçacığında ölçülsün diye
+    # ortak batcher yerine sınıflandırıcı doğrudan kullanılır
+    review_classifier = classifier if current_profile() is not None else batcher
+    classified_reviews = []
+    with stage_timer("fetch_and_classify"):
+        for batch_results in review_classifier.classify_review_stream(review_pages, threshold=0.5):
+            classified_reviews.extend(batch_results)
+            REVIEWS_PROCESSED.inc(len(batch_results))
+    stats["unique_reviews"] = len(classified_reviews)
+    if deduplicator is not None:
+        if expand_duplicates:
+            return deduplicator.expand(classified_reviews)
+        deduplicator.attach_counts(classified_reviews)
+    return classified_reviews
 
 
-@app.post("/predict")
-def predict(request: TextRequest):
-    asin = get_asin_from_link(request.link)
+def profiling_requested(profile: bool, x_profile: str) -> bool:
+    """
+    İsteğin ?profile=1 ya da X-Profile: 1 ile profil istediğini kontrol eder.
+    """
+    return profile or (x_profile or "").lower() in ("1", "true", "yes")
 
-    # 1. Amazon yorumlarını çekme
-    reviews = amazon_api.get_amazon_reviews(asin)
-    if not reviews:
-        return {"message": "Yorumlar alınamadı. İşlem sonlandırıldı."}
 
-    # 2. Yorumları sınıflandırma
-    print("Yorumlar sınıflandırılıyor...")
-    classified_reviews = classifier.classify_reviews(reviews, threshold=0.5)
+def run_profiled(fn, *args) -> JSONResponse:
+    """
+    Fonksiyonu profil altında çalıştırır; yanıtın JSON'a dönüştürülmesini de ayrı bir aşama olarak ölçer.
+    PROFILE_DIR ortam değişkeni tanımlıysa profil diske de kaydedilir.
+
+    Returns:
+        JSONResponse: Normal yanıt alanları ve "profile" alanı (zaman çizelgesi, en pahalı fonksiyonlar).
+    """
+    with RequestProfile() as profile:
+        result = fn(*args)
+        with profile.span("json_encoding"):
+            json.dumps(result, ensure_ascii=False)
+
+    report = profile.report()
+    profile_dir = os.getenv("PROFILE_DIR")
+    if profile_dir:
+        report["saved_to"] = profile.save(profile_dir)
+    return JSONResponse(content={**result, "profile": report})
 
+
+def sampling_info(stats: dict) -> dict:
+    """
+    Yanıtlara eklenen örneklem bilgisini döner: kullanılan yorum sayısı, yakın kopyalar birleştirildikten sonra
+    kalan yorum sayısı, üründeki toplam yorum sayısı ve strateji.
+    """
+    return {
+        "sampled_reviews": stats.get("sampled_reviews", 0),
+        "unique_reviews": stats.get("unique_reviews"),
+        "total_reviews": stats.get("total_reviews"),
+        "sampling_strategy": stats.get("strategy")
+    }
+
+
+def classify_asin(link, budget: dict = None) -> dict:
+    asin = get_asin_from_link(link)
+    if isinstance(asin, dict):
+        return asin
+
+    # 1-2. Amazon yorumlarını çekme ve sınıflandırma (sayfalar indikçe)
+    print("Yorumlar çekiliyor ve sınıflandırılıyor...")
+    stats = {}
+    # /classify her yorumu ayrı döner; yakın kopyalar yalnızca bir kez sınıflandırılır
+    classified_reviews = fetch_and_classify(asin, budget, stats, expand_duplicates=True)
     if not classified_reviews:
-        return {"message": 'Sınıflandırma sonuçları alınamadı. İşlem sonlandırıldı.'}
+        return {"message": "Yorumlar alınamadı. İşlem sonlandırıldı."}
+    return {"classified_reviews": classified_reviews, **sampling_info(stats)}
 
-    # 3. Yorumları kategori bazında grupla
+
+@app.post("/classify")
+def classify(link, max_reviews: int = None, max_pages: int = None, strategy: str = None, profile: bool = False,
+             x_profile: str = Header(None)):
+    require_model()
+    budget = review_budget(max_reviews, max_pages, strategy)
+    if profiling_requested(profile, x_profile):
+        return run_profiled(classify_asin, link, budget)
+    return classify_asin(link, budget)
+
+
+def group_by_category(classified_reviews: list) -> dict:
+    """
+    Sınıflandırılmış yorumları kategori bazında gruplar. Birden çok yorumu temsil eden yorumlar
+    "yorum (xN)" biçiminde etiketlenir; böylece özet isteminde bir kez ve ağırlığıyla yer alır.
+
+    Args:
+        classified_reviews (list): Sınıflandırılmış yorumlar.
+
+    Returns:
+        dict: Kategorilere göre gruplandırılmış yorumlar.
+    """
     print("Yorumlar kategorilere göre gruplanıyor...")
     kategori_yorumlari = {}
-    for item in classified_reviews:
-        for kategori in item["categories"]:
-            kategori_yorumlari.setdefault(kategori, []).append(item["review"])
+    with stage_timer("grouping"):
+        for item in classified_reviews:
+            review = label_review(item["review"], item.get("count", 1))
+            for kategori in item["categories"]:
+                kategori_yorumlari.setdefault(kategori, []).append(review)
     print("Yorumlar kategorilere göre başarıyla gruplanmıştır.")
+    return kategori_yorumlari
+
+
+def run_predict_pipeline(asin: str, budget: dict = None, progress=None) -> dict:
+    """
+    Yorumları çekme, sınıflandırma, gruplama ve özetleme adımlarını çalıştırır.
+
+    Args:
+        asin (str): Ürüne ait ASIN kodu.
+        budget (dict): Yorum bütçesi (opsiyonel).
+        progress (callable): Her aşamanın başında aşama adıyla çağrılan fonksiyon (opsiyonel).
+
+    Returns:
+        dict: /predict yanıtı.
+    """
+    progress = progress or (lambda stage: None)
+
+    # 1-2. Amazon yorumlarını çekme ve sınıflandırma (sayfalar indikçe)
+    progress("fetching_and_classifying")
+    print("Yorumlar çekiliyor ve sınıflandırılıyor...")
+    stats = {}
+    classified_reviews = fetch_and_classify(asin, budget, stats)
+    if not classified_reviews:
+        return {"message": "Yorumlar alınamadı. İşlem sonlandırıldı."}
+
+    # 3. Yorumları kategori bazında grupla
+    progress("grouping")
+    kategori_yorumlari = group_by_category(classified_reviews)
 
     # 4. Özetleme işlemi
+    progress("summarizing")
     print("Yorumlar özetleniyor...")
-    summary = summarizer.summarize_reviews(kategori_yorumlari)
+    with stage_timer("summarization"):
+        summary, cache_hit = summarizer.summarize_reviews_cached(kategori_yorumlari)
     if summary:
-        return {"conclusion": summary, "categories": kategori_yorumlari}
+        return {
+            "conclusion": summary,
+            "categories": kategori_yorumlari,
+            "category_counts": weighted_category_counts(classified_reviews),
+            "summary_cache": "hit" if cache_hit else "miss",
+            **sampling_info(stats)
+        }
     else:
         return {"message": "Özetleme işlemi başarısız oldu."}
+
+
+def coalesced_predict(asin: str, budget: dict = None, progress=None) -> dict:
+    """
+    Aynı ASIN için çalışan bir analiz varsa ona katılır ve onun sonucunu döner; yoksa analizi başlatır.
+    Böylece aynı ürüne eşzamanlı gelen istekler RapidAPI, sınıflandırma ve özetlemeyi bir kez çalıştırır.
+    Farklı yorum bütçeleriyle gelen istekler birleştirilmez.
+
+    Args:
+        asin (str): Ürüne ait ASIN kodu.
+        budget (dict): Yorum bütçesi (opsiyonel).
+        progress (callable): Aşama bildirimi; yalnızca analizi başlatan çağrı için kullanılır.
+
+    Returns:
+        dict: /predict yanıtı.
+    """
+    key = asin if budget is None else (asin, tuple(sorted(budget.items())))
+    result, shared = predict_flight.do(key, run_predict_pipeline, asin, budget, progress)
+    if shared:
+        COALESCED_REQUESTS.inc()
+        print(f"{asin} için devam eden analizin sonucu paylaşıldı.")
+    return result
+
+
+def run_incremental_pipeline(asin: str) -> dict:
+    """
+    Ürünü artımlı analiz eder: yalnızca yeni yorumlar sınıflandırılır, özet yalnızca kategori dağılımı
+    anlamlı ölçüde değiştiyse yeniden üretilir.
+
+    Args:
+        asin (str): Ürüne ait ASIN kodu.
+
+    Returns:
+        dict: /predict yanıtı; ek olarak category_counts, new_reviews ve resummarized alanları.
+    """
+    review_classifier = classifier if current_profile() is not None else batcher
+    with stage_timer("incremental_analysis"):
+        result = incremental_analyzer.analyze(asin, review_classifier)
+    REVIEWS_PROCESSED.inc(result.get("new_reviews", 0))
+    return result
+
+
+def predict_link(link: str, incremental: bool = False, budget: dict = None) -> dict:
+    asin = get_asin_from_link(link)
+    if isinstance(asin, dict):
+        return asin
+    # Profil istenen istek kendi çalıştırmasını ölçmelidir, birleştirilmez
+    if current_profile() is not None:
+        return run_incremental_pipeline(asin) if incremental else run_predict_pipeline(asin, budget)
+    if incremental:
+        result, shared = predict_flight.do(("incremental", asin), run_incremental_pipeline, asin)
+        if shared:
+            COALESCED_REQUESTS.inc()
+        return result
+    return coalesced_predict(asin, budget)
+
+
+@app.post("/predict")
+def predict(request: TextRequest, incremental: bool = False, profile: bool = False,
+            x_profile: str = Header(None)):
+    """
+    Ürün yorumlarını analiz eder. ?incremental=1 ile yalnızca yeni yorumlar sınıflandırılır ve özet yalnızca
+    kategori dağılımı değiştiğinde yeniden üretilir. ?profile=1 ya da X-Profile: 1 ile yanıta isteğin profili eklenir.
+
+    max_reviews / max_pages verilirse yalnızca bu kadar yorum çekilir; strategy ile en faydalı (top), yıldız
+    puanlarına dengeli dağıtılmış (stratified) ya da en yeni (recent) yorumlar seçilir. Yanıtta kullanılan
+    (sampled_reviews) ve toplam (total_reviews) yorum sayıları döner.
+    """
+    require_model()
+    if incremental:
+        # Artımlı analiz ürünün tüm yorumlarını saklanan sonuçlarla karşılaştırır; örneklemle birlikte kullanılamaz
+        budget = None
+    else:
+        budget = review_budget(request.max_reviews, request.max_pages, request.strategy)
+    if profiling_requested(profile, x_profile):
+        return run_profiled(predict_link, request.link, incremental, budget)
+    return predict_link(request.link, incremental, budget)
+
+
+def sse_event(event: str, data) -> str:
+    """
+    Server-Sent-Events biçiminde tek bir olay üretir.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def stream_predict_events(asin: str, budget: dict = None):
+    """
+    /predict/stream için aşama, kategori ve özet parçası olaylarını üretir.
+
+    Olay türleri: stage (aşama adı), categories (gruplanmış yorumlar), token (özet parçası),
+    done (tam özet, kategori başına yorum sayıları ve örneklem bilgisi) ve error (hata mesajı).
+    """
+    yield sse_event("stage", "fetching_and_classifying")
+    stats = {}
+    classified_reviews = fetch_and_classify(asin, budget, stats)
+    if not classified_reviews:
+        yield sse_event("error", {"message": "Yorumlar alınamadı. İşlem sonlandırıldı."})
+        return
+
+    yield sse_event("stage", "grouping")
+    kategori_yorumlari = group_by_category(classified_reviews)
+    yield sse_event("categories", kategori_yorumlari)
+
+    yield sse_event("stage", "summarizing")
+    cache_hit = summarizer.get_cached_summary(kategori_yorumlari) is not None
+    summary_parts = []
+    try:
+        for token in summarizer.summarize_reviews_stream(kategori_yorumlari):
+            summary_parts.append(token)
+            yield sse_event("token", token)
+    except Exception as e:
+        # Yarıda kesilen özet sonuç olarak gönderilmez
+        print(f"Özetleme işlemi sırasında bir hata oluştu: {str(e)}")
+        yield sse_event("error", {"message": "Özetleme işlemi başarısız oldu."})
+        return
+
+    summary = "".join(summary_parts).strip()
+    if summary:
+        yield sse_event("done", {"conclusion": summary,
+                                 "category_counts": weighted_category_counts(classified_reviews),
+                                 "summary_cache": "hit" if cache_hit else "miss", **sampling_info(stats)})
+    else:
+        yield sse_event("error", {"message": "Özetleme işlemi başarısız oldu."})
+
+
+@app.post("/predict/stream")
+def predict_stream(request: TextRequest):
+    """
+    /predict ile aynı analizi yapar; aşamaları ve özet parçalarını üretildikçe Server-Sent-Events olarak gönderir.
+    """
+    require_model()
+    budget = review_budget(request.max_reviews, request.max_pages, request.strategy)
+    asin = get_asin_from_link(request.link)
+    if isinstance(asin, dict):
+        return asin
+
+    return StreamingResponse(
+        stream_predict_events(asin, budget),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+class BatchRequest(BaseModel):
+    links: list[str]
+    # Yorum bütçesi her ürüne ayrı ayrı uygulanır
+    max_reviews: int = Field(None, ge=1)
+    max_pages: int = Field(None, ge=1)
+    strategy: str = None
+
+
+def stream_batch_results(asins: list, budget: dict = None):
+    """
+    Ürünleri eşzamanlı analiz eder ve her ürünün sonucunu tamamlandığı anda NDJSON satırı olarak üretir.
+
+    Ürünlerin yorumları aynı anda çekilir; sınıflandırma ortak batcher üzerinden aynı ileri geçişlerde
+    toplanır ve özetler paralel üretilir.
+    """
+    max_concurrency = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="batch-product")
+    try:
+        futures = {executor.submit(coalesced_predict, asin, budget): asin for asin in asins}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"message": f"Analiz sırasında bir hata oluştu: {str(e)}"}
+            yield json.dumps({"asin": futures[future], **result}, ensure_ascii=False) + "\n"
+    finally:
+        # İstemci bağlantıyı keserse henüz başlamamış ürünler iptal edilir
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@app.post("/predict/batch")
+def predict_batch(request: BatchRequest):
+    """
+    Birden çok ürün linkini ya da ASIN kodunu analiz eder. Her ürünün sonucu tamamlandığı anda
+    application/x-ndjson akışında ayrı bir satır olarak gönderilir; ASIN bulunamayan linkler hemen raporlanır.
+    """
+    require_model()
+    max_links = int(os.getenv("BATCH_MAX_LINKS", "50"))
+    if len(request.links) > max_links:
+        raise HTTPException(status_code=422, detail=f"Bir istekte en fazla {max_links} ürün gönderilebilir.")
+    budget = review_budget(request.max_reviews, request.max_pages, request.strategy)
+
+    asins = []
+    invalid_lines = []
+    for link in request.links:
+        asin = link.strip().upper() if re.fullmatch(r"[A-Za-z0-9]{10}", link.strip()) else get_asin_from_link(link)
+        if isinstance(asin, dict):
+            invalid_lines.append(json.dumps({"link": link, **asin}, ensure_ascii=False) + "\n")
+        elif asin not in asins:
+            asins.append(asin)
+
+    def stream():
+        yield from invalid_lines
+        yield from stream_batch_results(asins, budget)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs/predict")
+def submit_predict_job(request: TextRequest):
+    """
+    Analizi arka planda başlatır ve hemen bir iş kimliği döner. Sonuç GET /jobs/{job_id} ile sorgulanır.
+    """
+    require_model()
+    budget = review_budget(request.max_reviews, request.max_pages, request.strategy)
+    asin = get_asin_from_link(request.link)
+    if isinstance(asin, dict):
+        return asin
+
+    try:
+        job_id = job_manager.submit(coalesced_predict, asin, budget)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    İşin durumunu (queued, running, done, failed), çalıştığı aşamayı ve bittiyse sonucunu döner.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı.")
+    return job
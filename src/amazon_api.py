@@ -1,7 +1,18 @@
 import requests
 import os
+import json
 import math
+import hashlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from review_store import ReviewStore
+from metrics import PAGES_FAILED, PAGES_FETCHED, record_cache, stage_timer
+from rate_limiting import RateLimitedSession
+
+# stratified örneklemede bütçenin dağıtıldığı yıldız filtreleri
+STAR_RATINGS = ("5_STARS", "4_STARS", "3_STARS", "2_STARS", "1_STARS")
 
 
 class AmazonAPI:
@@ -10,14 +21,26 @@ class AmazonAPI:
 
     Attributes:
         api_key (str): API erişimi için kullanılan RapidAPI anahtarı.
+        max_workers (int): Sayfaların eşzamanlı çekilmesinde kullanılan en fazla iş parçacığı sayısı.
+        session (RateLimitedSession): Bağlantıları yeniden kullanan (keep-alive) ortak HTTP oturumu; istekler
+            hız sınırlayıcı, zaman aşımı, yeniden deneme ve devre kesiciden geçer.
+        review_store (ReviewStore): Yorumların ASIN bazında saklandığı yerel önbellek (opsiyonel).
 
     Methods:
-        get_amazon_reviews(asin): Amazon ürün yorumlarını çeker ve liste olarak döner.
+        iter_review_records(asin, concurrent, use_cache, max_reviews, max_pages, strategy, stats): Yorum kayıtlarını
+            (kimlik, puan, tarih, yorum) sayfa sayfa üretir; bütçe verilirse yalnızca bütçe kadar yorum çekilir.
+        iter_amazon_reviews(asin, concurrent, max_reviews, max_pages, strategy, stats): Amazon ürün yorumlarını sayfa sayfa üretir.
+        get_amazon_reviews(asin, concurrent, max_reviews, max_pages, strategy, stats): Amazon ürün yorumlarını çeker ve liste olarak döner.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_workers: int = None, review_store: ReviewStore = None) -> None:
         """
         AmazonAPI sınıfını başlatır ve gerekli ortam değişkenlerini yükler.
+
+        Args:
+            max_workers (int): Eşzamanlı sayfa çekme için iş parçacığı sayısı.
+                Verilmezse AMAZON_API_MAX_WORKERS ortam değişkeni, o da yoksa 8 kullanılır.
+            review_store (ReviewStore): Yorumların saklanacağı yerel önbellek. Verilmezse önbellek kullanılmaz.
         """
 
         # .env dosyasının tam yolunu belirle
@@ -31,6 +54,20 @@ class AmazonAPI:
             raise ValueError(
                 "RAPIDAPI_KEY .env dosyasından yüklenemedi. Lütfen .env dosyanızı kontrol edin ve RAPIDAPI_KEY değerini ekleyin.")
         self.host = "real-time-amazon-data.p.rapidapi.com"
+        # Çevrimdışı testlerde istekler tests/rapidapi_mock_server.py'ye yönlendirilebilir
+        self.base_url = os.getenv("RAPIDAPI_BASE_URL", f"https://{self.host}").rstrip("/")
+        self.max_workers = max_workers or int(os.getenv("AMAZON_API_MAX_WORKERS", "8"))
+        self.review_store = review_store
+
+        # Tüm sayfa istekleri aynı bağlantı havuzunu, hız sınırlayıcıyı ve devre kesiciyi kullanır
+        self.session = RateLimitedSession()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "x-rapidapi-key": self.api_key,
+            "x-rapidapi-host": self.host
+        })
 
     def calculate_page_count(self, total_reviews: int) -> int:
         """
@@ -44,81 +81,454 @@ class AmazonAPI:
         """
         return math.ceil(total_reviews / 10)
 
-    def get_amazon_reviews(self, asin: str) -> list:
+    def _build_querystring(self, asin: str, page: int, sort_by: str = "TOP_REVIEWS", star_rating: str = "ALL") -> dict:
         """
-        Amazon ürün yorumlarını tüm sayfalar boyunca API'den çeken bir fonksiyon.
+        Yorum sayfası isteği için sorgu parametrelerini oluşturur.
 
         Args:
             asin (str): Ürüne ait ASIN kodu.
+            page (int): İstenen sayfa numarası.
+            sort_by (str): Yorumların sıralama ölçütü (TOP_REVIEWS veya MOST_RECENT).
+            star_rating (str): Yıldız filtresi (ALL, 5_STARS, ..., 1_STARS).
 
         Returns:
-            list: Tüm sayfalardan gelen yorumları içeren bir liste.
+            dict: Sorgu parametreleri.
         """
-        url = f"https://{self.host}/product-reviews"
-        headers = {
-            "x-rapidapi-key": self.api_key,
-            "x-rapidapi-host": self.host
-        }
-
-        # İlk sayfa sorgusu ile toplam yorum sayısını öğren
-        querystring = {
+        return {
             "asin": asin,
             "country": "TR",
-            "sort_by": "TOP_REVIEWS",
-            "star_rating": "ALL",
+            "sort_by": sort_by,
+            "star_rating": star_rating,
             "verified_purchases_only": "false",
             "images_or_videos_only": "false",
             "current_format_only": "false",
-            "page": "1"
+            "page": str(page)
+        }
+
+    def _parse_review(self, review: dict) -> dict:
+        """
+        API'den gelen ham yorumu saklanacak kayıt biçimine dönüştürür.
+
+        Args:
+            review (dict): API yanıtındaki yorum nesnesi.
+
+        Returns:
+            dict: review_id, rating, review_date ve review_comment alanlarını içeren kayıt.
+        """
+        comment = review.get('review_comment', 'No Comment')
+        review_id = review.get('review_id')
+        if not review_id:
+            # Kimliği olmayan yorumlar için içerikten kararlı bir kimlik üret
+            raw_id = f"{review.get('review_author', '')}|{review.get('review_date', '')}|{comment}"
+            review_id = hashlib.sha1(raw_id.encode("utf-8")).hexdigest()
+        return {
+            "review_id": review_id,
+            "rating": review.get('review_star_rating'),
+            "review_date": review.get('review_date'),
+            "review_comment": comment
         }
 
-        response = requests.get(url, headers=headers, params=querystring)
+    def _fetch_first_page(self, asin: str, sort_by: str = "TOP_REVIEWS", star_rating: str = "ALL") -> tuple:
+        """
+        İlk sayfayı çekerek toplam yorum sayısını ve ilk sayfadaki yorum kayıtlarını döner.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            sort_by (str): Yorumların sıralama ölçütü.
+            star_rating (str): Yıldız filtresi. Varsayılan olarak "ALL".
+
+        Returns:
+            tuple: (toplam yorum sayısı, yorum kayıtları). İstek başarısız olursa None döner.
+        """
+        with stage_timer("rapidapi_page"):
+            first_page = self._request_first_page(asin, sort_by, star_rating)
+        (PAGES_FAILED if first_page is None else PAGES_FETCHED).inc()
+        return first_page
+
+    def _request_first_page(self, asin: str, sort_by: str, star_rating: str) -> tuple:
+        url = f"{self.base_url}/product-reviews"
+        try:
+            response = self.session.get(url, params=self._build_querystring(asin, 1, sort_by, star_rating))
+        except requests.RequestException as e:
+            print(f"API çağrısı başarısız oldu. Hata mesajı: {str(e)}")
+            return None
 
         if response.status_code != 200:
             print(f"API çağrısı başarısız oldu. Status code: {response.status_code}, Hata mesajı: {response.text}")
-            return []
+            return None
 
         data = response.json()
         if 'data' not in data or 'total_reviews' not in data['data']:
             print(
                 "Toplam yorum sayısı bilgisi bulunamadı. API yanıt formatı değişmiş olabilir, lütfen API dökümantasyonunu kontrol edin.")
-            return []
+            return None
 
-        total_reviews = data['data']['total_reviews']
-        page_count = self.calculate_page_count(total_reviews)
+        records = [self._parse_review(review) for review in data['data'].get('reviews', [])]
+        return data['data']['total_reviews'], records
 
-        all_reviews = []
+    def _fetch_page(self, asin: str, page: int, sort_by: str = "TOP_REVIEWS", star_rating: str = "ALL") -> list:
+        """
+        Tek bir yorum sayfasını ortak oturum üzerinden çeker.
 
-        # İlk sayfanın verilerini işleyin
-        if 'reviews' in data['data']:
-            reviews_list = data['data']['reviews']
-            all_reviews.extend([
-                review.get('review_comment', 'No Comment')
-                for review in reviews_list
-            ])
-
-        # Kalan sayfalar için veri çekme
-        for page in range(2, page_count + 1):
-            querystring["page"] = str(page)
-            response = requests.get(url, headers=headers, params=querystring)
-
-            if response.status_code != 200:
-                print(
-                    f"Page {page} için API çağrısı başarısız oldu. Status code: {response.status_code}, Hata mesajı: {response.text}")
-                continue
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            page (int): Çekilecek sayfa numarası.
+            sort_by (str): Yorumların sıralama ölçütü.
+            star_rating (str): Yıldız filtresi. Varsayılan olarak "ALL".
+
+        Returns:
+            list: Sayfadaki yorum kayıtları. Sayfa alınamazsa None döner.
+        """
+        with stage_timer("rapidapi_page"):
+            page_records = self._request_page(asin, page, sort_by, star_rating)
+        (PAGES_FAILED if page_records is None else PAGES_FETCHED).inc()
+        return page_records
+
+    def _request_page(self, asin: str, page: int, sort_by: str, star_rating: str) -> list:
+        url = f"{self.base_url}/product-reviews"
+        try:
+            response = self.session.get(url, params=self._build_querystring(asin, page, sort_by, star_rating))
+        except requests.RequestException as e:
+            print(f"Page {page} için API çağrısı başarısız oldu. Hata mesajı: {str(e)}")
+            return None
+
+        if response.status_code != 200:
+            print(
+                f"Page {page} için API çağrısı başarısız oldu. Status code: {response.status_code}, Hata mesajı: {response.text}")
+            return None
+
+        try:
+            data = response.json()
+        except json.JSONDecodeError as e:
+            print(f"Page {page} yanıtı çözülürken bir hata oluştu: {str(e)}")
+            return None
+
+        if 'data' in data and 'reviews' in data['data']:
+            return [self._parse_review(review) for review in data['data']['reviews']]
+
+        print(
+            f"Page {page} verileri alınamadı. API yanıt formatı değişmiş olabilir, lütfen API dökümantasyonunu kontrol edin.")
+        return None
+
+    def iter_review_records(self, asin: str, concurrent: bool = True, use_cache: bool = True,
+                            max_reviews: int = None, max_pages: int = None, strategy: str = "top", stats: dict = None):
+        """
+        Ürün yorum kayıtlarını sayfa sayfa üreten (generator) bir fonksiyon.
+
+        review_store tanımlıysa ve ürünün kayıtları TTL süresi içindeyse yorumlar doğrudan
+        önbellekten gelir. Kayıtlar eskimişse yalnızca en yeni sayfalar, daha önce görülmüş
+        bir yoruma ulaşılana kadar çekilir ve önbelleğe eklenir. Ürün hiç çekilmemişse tüm
+        sayfalar API'den çekilir ve eksiksiz alındıysa önbelleğe yazılır.
+
+        max_reviews ya da max_pages verilirse yalnızca bütçe kadar yorum API'den çekilir; örneklem ürünün
+        tüm yorumlarını temsil etmediği için önbellek bu durumda ne okunur ne de yazılır.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            concurrent (bool): Kalan sayfaların eşzamanlı çekilip çekilmeyeceği. Varsayılan olarak True.
+            use_cache (bool): Yerel önbelleğin kullanılıp kullanılmayacağı. Varsayılan olarak True.
+            max_reviews (int): Çekilecek en fazla yorum sayısı (opsiyonel).
+            max_pages (int): Çekilecek en fazla sayfa sayısı (opsiyonel). Sayfa başına 10 yorum vardır.
+            strategy (str): Bütçe verildiğinde örnekleme yöntemi: "top" (en faydalı yorumlar),
+                "recent" (en yeni yorumlar) veya "stratified" (bütçe yıldız puanlarına eşit dağıtılır; her
+                yıldızın ilk sayfası da max_pages'ten sayılır; max_pages 1 ise "top" kullanılır).
+                Varsayılan olarak "top".
+            stats (dict): Verilirse total_reviews, sampled_reviews ve strategy alanlarıyla doldurulur.
+
+        Yields:
+            list: Bir sayfadaki yorum kayıtlarının listesi.
+        """
+        stats = stats if stats is not None else {}
+        budget = self._review_budget(max_reviews, max_pages)
+        if strategy == "stratified" and max_pages == 1:
+            # Tek sayfalık bütçe yıldız puanlarına bölünemez
+            print("Sayfa bütçesi 1 olduğu için stratified yerine top stratejisi kullanılıyor.")
+            strategy = "top"
+        if budget is None:
+            pages = self._iter_all_records(asin, concurrent, use_cache, stats)
+        elif strategy == "top":
+            pages = self._iter_remote_records(asin, concurrent, max_reviews=budget, stats=stats)
+        elif strategy == "recent":
+            pages = self._iter_remote_records(asin, concurrent, sort_by="MOST_RECENT", max_reviews=budget, stats=stats)
+        elif strategy == "stratified":
+            pages = self._iter_stratified_records(asin, concurrent, budget, stats, max_pages=max_pages)
+        else:
+            raise ValueError(f"Desteklenmeyen strateji: {strategy}. Geçerli değerler: 'top', 'stratified', 'recent'.")
+
+        stats.update(strategy=strategy if budget is not None else "all", sampled_reviews=0)
+        for page_records in pages:
+            stats["sampled_reviews"] += len(page_records)
+            yield page_records
+
+    def _review_budget(self, max_reviews: int = None, max_pages: int = None) -> int:
+        """
+        Yorum ve sayfa sınırlarından çekilecek en fazla yorum sayısını hesaplar.
+
+        Returns:
+            int: Yorum bütçesi; sınır verilmediyse None.
+        """
+        limits = [limit for limit in (max_reviews, max_pages * 10 if max_pages else None) if limit]
+        return min(limits) if limits else None
+
+    def _iter_all_records(self, asin: str, concurrent: bool, use_cache: bool, stats: dict):
+        """
+        Ürünün tüm yorumlarını önbellekten ya da API'den sayfa sayfa üretir.
+        """
+        if self.review_store is None or not use_cache:
+            yield from self._iter_remote_records(asin, concurrent, stats=stats)
+            return
 
+        if self.review_store.has_product(asin):
+            record_cache("review_store", hits=1)
+            if self.review_store.is_fresh(asin):
+                print(f"{asin} için yorumlar önbellekten okunuyor.")
+            else:
+                print(f"{asin} için önbellek eskimiş, yalnızca yeni yorumlar çekiliyor...")
+                self._refresh_new_records(asin)
+            stats["total_reviews"] = self.review_store.get_total_reviews(asin)
+            records = self.review_store.get_reviews(asin)
+            for start in range(0, len(records), 10):
+                yield records[start:start + 10]
+            return
+
+        record_cache("review_store", misses=1)
+        yield from self._iter_remote_records(asin, concurrent, stats=stats)
+
+    def _iter_pages(self, asin: str, first_page_records: list, pages: range, concurrent: bool,
+                    sort_by: str = "TOP_REVIEWS", star_rating: str = "ALL"):
+        """
+        İlk sayfanın kayıtlarını ve ardından kalan sayfaları sayfa sırasıyla üretir; kalan sayfalar
+        eşzamanlı çekilirken tüketici önceki sayfaları işleyebilir.
+
+        Yields:
+            list: Bir sayfadaki yorum kayıtları; alınamayan sayfa için None.
+        """
+        if concurrent and len(pages) > 1:
+            # Kalan sayfaları hemen kuyruğa al, sonuçları sayfa sırasıyla üret
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            # İş parçacıkları isteğin bağlamını (ör. etkin profil) devralır
+            futures = [executor.submit(contextvars.copy_context().run, self._fetch_page, asin, page, sort_by,
+                                       star_rating)
+                       for page in pages]
             try:
-                data = response.json()
-                if 'data' in data and 'reviews' in data['data']:
-                    reviews_list = data['data']['reviews']
-                    all_reviews.extend([
-                        review.get('review_comment', 'No Comment')
-                        for review in reviews_list
-                    ])
-                else:
-                    print(
-                        f"Page {page} verileri alınamadı. API yanıt formatı değişmiş olabilir, lütfen API dökümantasyonunu kontrol edin.")
-            except json.JSONDecodeError as e:
-                print(f"Page {page} yanıtı çözülürken bir hata oluştu: {str(e)}")
-
-        return all_reviews if all_reviews else []
+                yield first_page_records
+                for future in futures:
+                    yield future.result()
+            finally:
+                # Tüketici erken bırakırsa bekleyen istekleri iptal et
+                executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            yield first_page_records
+            for page in pages:
+                yield self._fetch_page(asin, page, sort_by, star_rating)
+
+    def _iter_remote_records(self, asin: str, concurrent: bool, sort_by: str = "TOP_REVIEWS",
+                             max_reviews: int = None, stats: dict = None, star_rating: str = "ALL",
+                             first_page: tuple = None):
+        """
+        Yorum sayfalarını API'den çeker; kalan sayfalar arka planda inerken sayfaları sırayla üretir.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            concurrent (bool): Kalan sayfaların eşzamanlı çekilip çekilmeyeceği.
+            sort_by (str): Yorumların sıralama ölçütü. Varsayılan olarak "TOP_REVIEWS".
+            max_reviews (int): Verilirse yalnızca bu kadar yorum için sayfa çekilir ve önbelleğe yazılmaz.
+            stats (dict): Verilirse total_reviews alanı doldurulur.
+            star_rating (str): Yıldız filtresi. Varsayılan olarak "ALL".
+            first_page (tuple): Daha önce çekilmiş ilk sayfa (toplam yorum sayısı, kayıtlar).
+
+        Yields:
+            list: Bir sayfadaki yorum kayıtlarının listesi.
+        """
+        first_page = first_page or self._fetch_first_page(asin, sort_by, star_rating)
+        if first_page is None:
+            return
+        total_reviews, first_page_records = first_page
+        if stats is not None:
+            stats["total_reviews"] = total_reviews
+        limit = total_reviews if max_reviews is None else min(total_reviews, max_reviews)
+        page_count = self.calculate_page_count(limit)
+
+        all_records = []
+        failed_pages = 0
+        for page_records in self._iter_pages(asin, first_page_records, range(2, page_count + 1), concurrent,
+                                             sort_by, star_rating):
+            if page_records is None:
+                failed_pages += 1
+                continue
+            if max_reviews is not None:
+                page_records = page_records[:max_reviews - len(all_records)]
+            if page_records:
+                all_records.extend(page_records)
+                yield page_records
+
+        if self.review_store is not None and all_records and max_reviews is None and star_rating == "ALL":
+            if failed_pages:
+                print(f"{failed_pages} sayfa alınamadığı için {asin} yorumları önbelleğe yazılmadı.")
+            else:
+                self.review_store.save_reviews(asin, all_records, total_reviews)
+
+    def _allocate_budget(self, totals: dict, budget: int) -> dict:
+        """
+        Yorum bütçesini gruplara eşit dağıtır; yeterli yorumu olmayan grupların payı diğerlerine aktarılır.
+
+        Args:
+            totals (dict): Grup başına mevcut yorum sayısı.
+            budget (int): Toplam yorum bütçesi.
+
+        Returns:
+            dict: Grup başına çekilecek yorum sayısı.
+        """
+        allocation = {group: 0 for group in totals}
+        open_groups = [group for group, total in totals.items() if total > 0]
+        remaining = budget
+        while remaining > 0 and open_groups:
+            share = max(1, remaining // len(open_groups))
+            for group in list(open_groups):
+                take = min(share, totals[group] - allocation[group], remaining)
+                allocation[group] += take
+                remaining -= take
+                if allocation[group] >= totals[group]:
+                    open_groups.remove(group)
+                if remaining == 0:
+                    break
+        return allocation
+
+    def _stratified_star_ratings(self, max_pages: int = None) -> tuple:
+        """
+        Sayfa bütçesi yıldız puanı sayısından azsa en uçtaki puanlardan başlayarak eşit aralıklı
+        max_pages kadar yıldız puanı seçer; aksi halde tüm yıldız puanlarını döner.
+        """
+        if max_pages is None or max_pages >= len(STAR_RATINGS):
+            return STAR_RATINGS
+        step = (len(STAR_RATINGS) - 1) / (max_pages - 1)
+        return tuple(STAR_RATINGS[round(i * step)] for i in range(max_pages))
+
+    def _iter_stratified_records(self, asin: str, concurrent: bool, budget: int, stats: dict, max_pages: int = None):
+        """
+        Yorum bütçesini yıldız puanlarına dağıtarak her puandan en faydalı yorumları çeker.
+
+        Her yıldız puanının ilk sayfası, o puandaki toplam yorum sayısını öğrenmek için birlikte çekilir.
+        max_pages verilirse bu ilk sayfalar da sayfa bütçesinden sayılır: bütçe yıldız puanı sayısından azsa
+        yalnızca bütçe kadar yıldız puanı sorgulanır, kalan sayfalar yıldız puanlarına paylaştırılır.
+
+        Yields:
+            list: Bir sayfadaki yorum kayıtlarının listesi.
+        """
+        star_ratings = self._stratified_star_ratings(max_pages)
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(star_ratings)))
+        try:
+            futures = {
+                star_rating: executor.submit(contextvars.copy_context().run, self._fetch_first_page, asin,
+                                             "TOP_REVIEWS", star_rating)
+                for star_rating in star_ratings
+            }
+            first_pages = {star_rating: future.result() for star_rating, future in futures.items()}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        totals = {star_rating: first_page[0] if first_page else 0 for star_rating, first_page in first_pages.items()}
+        stats["total_reviews"] = sum(totals.values())
+        capacities = totals
+        if max_pages is not None:
+            # Boş ya da alınamayan ilk sayfalar da bir istek harcadı; kalanlar yorumu olan puanlara dağıtılır
+            empty_pages = sum(1 for total in totals.values() if total == 0)
+            page_allocation = self._allocate_budget(
+                {star_rating: self.calculate_page_count(total) for star_rating, total in totals.items()},
+                max_pages - empty_pages)
+            capacities = {star_rating: min(total, page_allocation[star_rating] * 10)
+                          for star_rating, total in totals.items()}
+        allocation = self._allocate_budget(capacities, budget)
+        for star_rating in star_ratings:
+            if allocation[star_rating]:
+                yield from self._iter_remote_records(asin, concurrent, max_reviews=allocation[star_rating],
+                                                     star_rating=star_rating, first_page=first_pages[star_rating])
+
+    def _refresh_new_records(self, asin: str) -> None:
+        """
+        En yeni yorumlardan başlayarak, daha önce saklanmış bir yoruma ulaşılana kadar sayfaları
+        çeker ve yeni yorumları önbelleğe ekler.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+        """
+        first_page = self._fetch_first_page(asin, sort_by="MOST_RECENT")
+        if first_page is None:
+            print(f"{asin} için yeni yorumlar alınamadı, önbellekteki yorumlar kullanılıyor.")
+            return
+        total_reviews, page_records = first_page
+        page_count = self.calculate_page_count(total_reviews)
+        known_ids = self.review_store.get_review_ids(asin)
+
+        new_records = []
+        page = 1
+        while True:
+            for record in page_records:
+                if record["review_id"] in known_ids:
+                    self.review_store.add_new_reviews(asin, new_records, total_reviews)
+                    print(f"{asin} için {len(new_records)} yeni yorum önbelleğe eklendi.")
+                    return
+                new_records.append(record)
+
+            page += 1
+            if page > page_count:
+                break
+            page_records = self._fetch_page(asin, page, sort_by="MOST_RECENT")
+            if page_records is None:
+                # Arada sayfa kaybolursa önbellekte boşluk oluşmaması için güncellemeyi bırak
+                print(f"{asin} için yenileme yarıda kaldı, önbellekteki yorumlar kullanılıyor.")
+                return
+
+        # Bilinen hiçbir yoruma ulaşılamadı: tüm geçmiş yeniden çekilmiş demektir
+        if new_records:
+            self.review_store.save_reviews(asin, new_records, total_reviews)
+            print(f"{asin} için tüm yorumlar yenilendi.")
+        else:
+            self.review_store.add_new_reviews(asin, [], total_reviews)
+
+    def iter_amazon_reviews(self, asin: str, concurrent: bool = True, max_reviews: int = None,
+                            max_pages: int = None, strategy: str = "top", stats: dict = None):
+        """
+        Amazon ürün yorumlarını sayfa sayfa üreten (generator) bir fonksiyon.
+
+        İlk sayfadan toplam yorum sayısı öğrenildikten sonra kalan sayfaların indirilmesi
+        arka planda başlatılır; tüketici bir sayfayı işlerken sonraki sayfalar inmeye devam eder.
+        Sayfalar her durumda sayfa sırasına göre üretilir, alınamayan sayfalar atlanır.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            concurrent (bool): Kalan sayfaların eşzamanlı çekilip çekilmeyeceği. Varsayılan olarak True.
+            max_reviews (int): Çekilecek en fazla yorum sayısı (opsiyonel).
+            max_pages (int): Çekilecek en fazla sayfa sayısı (opsiyonel).
+            strategy (str): Bütçe verildiğinde örnekleme yöntemi: "top", "stratified" veya "recent".
+            stats (dict): Verilirse total_reviews, sampled_reviews ve strategy alanlarıyla doldurulur.
+
+        Yields:
+            list: Bir sayfadaki yorumların listesi.
+        """
+        for page_records in self.iter_review_records(asin, concurrent=concurrent, max_reviews=max_reviews,
+                                                     max_pages=max_pages, strategy=strategy, stats=stats):
+            yield [record["review_comment"] for record in page_records]
+
+    def get_amazon_reviews(self, asin: str, concurrent: bool = True, max_reviews: int = None,
+                           max_pages: int = None, strategy: str = "top", stats: dict = None) -> list:
+        """
+        Amazon ürün yorumlarını API'den çeken bir fonksiyon. Bütçe verilmezse tüm sayfalar çekilir.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            concurrent (bool): Kalan sayfaların eşzamanlı çekilip çekilmeyeceği. Varsayılan olarak True.
+            max_reviews (int): Çekilecek en fazla yorum sayısı (opsiyonel).
+            max_pages (int): Çekilecek en fazla sayfa sayısı (opsiyonel).
+            strategy (str): Bütçe verildiğinde örnekleme yöntemi: "top", "stratified" veya "recent".
+            stats (dict): Verilirse total_reviews, sampled_reviews ve strategy alanlarıyla doldurulur.
+
+        Returns:
+            list: Çekilen yorumları içeren bir liste.
+        """
+        all_reviews = []
+        for page_reviews in self.iter_amazon_reviews(asin, concurrent=concurrent, max_reviews=max_reviews,
+                                                     max_pages=max_pages, strategy=strategy, stats=stats):
+            all_reviews.extend(page_reviews)
+
+        return all_reviews
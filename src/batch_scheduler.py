@@ -0,0 +1,138 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+from classification import classify_in_batches
+
+
+class DynamicBatcher:
+    """
+    DynamicBatcher, eşzamanlı isteklerden gelen yorumları tek bir ileri geçişte toplayan bir zamanlayıcıdır.
+
+    Her çağrı yorumlarını bir kuyruğa bırakır. Arka plandaki iş parçacığı ilk isteği aldıktan sonra
+    en fazla max_wait_ms boyunca ya da max_batch_size yoruma ulaşılana kadar diğer istekleri bekler,
+    hepsini tek seferde sınıflandırıcıya verir ve sonuçları her çağırana kendi sırasıyla geri dağıtır.
+
+    Attributes:
+        classifier (ReviewClassifier): Ortak kullanılan sınıflandırıcı.
+        max_batch_size (int): Bir ileri geçişte toplanacak en fazla yorum sayısı.
+        max_wait_ms (float): İlk istekten sonra diğer istekler için beklenecek en uzun süre (milisaniye).
+
+    Methods:
+        predict_probabilities(review_list): Yorumların olasılıklarını ortak batch üzerinden hesaplar.
+        classify_reviews(review_list, threshold): Yorumları ortak batch üzerinden sınıflandırır.
+        classify_review_stream(review_pages, threshold, batch_size): Sayfa sayfa gelen yorumları sınıflandırır.
+        shutdown(): Arka plandaki iş parçacığını durdurur.
+    """
+
+    def __init__(self, classifier, max_batch_size: int = None, max_wait_ms: float = None) -> None:
+        """
+        Args:
+            classifier (ReviewClassifier): Ortak kullanılan sınıflandırıcı.
+            max_batch_size (int): Verilmezse BATCHER_MAX_BATCH_SIZE ortam değişkeni, o da yoksa 64 kullanılır.
+            max_wait_ms (float): Verilmezse BATCHER_MAX_WAIT_MS ortam değişkeni, o da yoksa 5 kullanılır.
+        """
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size or int(os.getenv("BATCHER_MAX_BATCH_SIZE", "64"))
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else float(os.getenv("BATCHER_MAX_WAIT_MS", "5"))
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="dynamic-batcher", daemon=True)
+        self._worker.start()
+
+    def predict_probabilities(self, review_list: list) -> np.ndarray:
+        """
+        Yorumları kuyruğa bırakır ve ortak batch'in sonucunu bekler.
+
+        Args:
+            review_list (list): Yorumların listesi.
+
+        Returns:
+            np.ndarray: Yorumların sırasıyla sigmoid olasılıkları.
+        """
+        future = Future()
+        self._queue.put((review_list, future))
+        return future.result()
+
+    def classify_reviews(self, review_list: list, threshold: float = 0.5) -> list:
+        """
+        Yorumları ortak batch üzerinden sınıflandırır; çıktı ReviewClassifier.classify_reviews ile aynıdır.
+
+        Args:
+            review_list (list): Sınıflandırılacak yorumların listesi.
+            threshold (float): Sınıflandırma için eşik değeri. Varsayılan olarak 0.5.
+
+        Returns:
+            list: Her yorumun sınıflandırma sonuçlarını içeren liste.
+        """
+        if not review_list:
+            return []
+
+        predictions = self.predict_probabilities(review_list)
+        return self.classifier.apply_threshold(review_list, predictions, threshold)
+
+    def classify_review_stream(self, review_pages, threshold: float = 0.5, batch_size: int = 32):
+        """
+        Sayfa sayfa gelen yorumları mikro-batch'ler halinde ortak batch üzerinden sınıflandırır.
+
+        Args:
+            review_pages (iterable): Her elemanı bir yorum listesi olan yinelenebilir nesne.
+            threshold (float): Sınıflandırma için eşik değeri. Varsayılan olarak 0.5.
+            batch_size (int): Bir seferde kuyruğa bırakılacak yorum sayısı. Varsayılan olarak 32.
+
+        Yields:
+            list: Bir mikro-batch'e ait sınıflandırma sonuçları.
+        """
+        yield from classify_in_batches(self.classify_reviews, review_pages, threshold, batch_size)
+
+    def shutdown(self) -> None:
+        """
+        Arka plandaki iş parçacığını durdurur.
+        """
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self, first_item: tuple) -> list:
+        """
+        İlk istekten sonra süre ya da boyut sınırına ulaşılana kadar kuyruktaki istekleri toplar.
+        """
+        pending = [first_item]
+        total = len(first_item[0])
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while total < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Kapatma sinyalini bu batch işlendikten sonra görmek için geri koy
+                self._queue.put(None)
+                break
+            pending.append(item)
+            total += len(item[0])
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            pending = self._collect(item)
+            texts = [text for review_list, _ in pending for text in review_list]
+            try:
+                predictions = self.classifier.predict_probabilities(texts)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for review_list, future in pending:
+                future.set_result(predictions[offset:offset + len(review_list)])
+                offset += len(review_list)
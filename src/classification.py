@@ -1,7 +1,38 @@
-
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import os
+import re
+import atexit
+import hashlib
+import numpy as np
 from dotenv import load_dotenv
+from lru_cache import LRUCache
+from model_loading import load_mmap_model
+from metrics import record_cache, stage_timer
+
+
+def classify_in_batches(classify_reviews, review_pages, threshold: float = 0.5, batch_size: int = 32):
+    """
+    Sayfa sayfa gelen yorumları batch_size kadar biriktirip verilen fonksiyonla sınıflandıran bir generator.
+    Sonuçlar yorumların geliş sırasını korur.
+
+    Args:
+        classify_reviews (callable): classify_reviews(review_list, threshold=...) imzalı sınıflandırma fonksiyonu
+            (ReviewClassifier.classify_reviews ya da DynamicBatcher.classify_reviews).
+        review_pages (iterable): Her elemanı bir yorum listesi olan yinelenebilir nesne.
+        threshold (float): Sınıflandırma için eşik değeri. Varsayılan olarak 0.5.
+        batch_size (int): Bir seferde sınıflandırılacak yorum sayısı. Varsayılan olarak 32.
+
+    Yields:
+        list: Bir mikro-batch'e ait sınıflandırma sonuçları.
+    """
+    buffer = []
+    for page_reviews in review_pages:
+        buffer.extend(page_reviews)
+        while len(buffer) >= batch_size:
+            batch, buffer = buffer[:batch_size], buffer[batch_size:]
+            yield classify_reviews(batch, threshold=threshold)
+
+    if buffer:
+        yield classify_reviews(buffer, threshold=threshold)
 
 
 class ReviewClassifier:
@@ -11,23 +42,266 @@ class ReviewClassifier:
     Attributes:
         model_checkpoint_path (str): Modelin kontrol noktası yolu.
         tokenizer (AutoTokenizer): Yorumları işlemek için kullanılan tokenizer.
-        model (AutoModelForSequenceClassification): Yorumları sınıflandırmak için kullanılan model.
+        model (AutoModelForSequenceClassification): Yorumları sınıflandırmak için kullanılan model (torch backend).
+        backend (str): Çıkarım altyapısı; "torch" veya "onnx".
+        precision (str): Torch backend'inde hesaplama hassasiyeti; "fp32", "bf16" veya "int8".
+        load_mode (str): Torch ağırlıklarının yüklenme biçimi; "default" veya "mmap".
+        onnx_session (onnxruntime.InferenceSession): ONNX Runtime oturumu (onnx backend).
+        batch_size (int): Bir ileri geçişte işlenecek en fazla yorum sayısı.
+        max_batch_tokens (int): Bir ileri geçişte (dolgu dahil) işlenecek en fazla token sayısı.
+        probability_cache (LRUCache): Yorum metni ve model parmak izine göre saklanan olasılık vektörleri.
 
     Methods:
+        predict_probabilities(review_list): Yorumların kategori olasılıklarını batch'ler halinde hesaplar.
         classify_reviews(review_list): Yorumları sınıflandırır ve sonuçları döndürür.
+        apply_threshold(review_list, predictions): Olasılıkları eşik değerine göre kategorilere dönüştürür.
+        save_cache(): Olasılık önbelleğini diske yazar.
+        classify_review_stream(review_pages): Sayfa sayfa gelen yorumları mikro-batch'ler halinde sınıflandırır.
     """
 
-    def __init__(self, model_checkpoint_path: str) -> None:
+    def __init__(self, model_checkpoint_path: str, batch_size: int = None, max_batch_tokens: int = None,
+                 backend: str = None, precision: str = None, cache_size: int = None, cache_path: str = None,
+                 load_mode: str = None) -> None:
         """
         Args:
             model_checkpoint_path (str): Modelin kontrol noktası yolu.
+            batch_size (int): Bir ileri geçişteki en fazla yorum sayısı. Verilmezse CLASSIFIER_BATCH_SIZE
+                ortam değişkeni, o da yoksa 32 kullanılır.
+            max_batch_tokens (int): Bir ileri geçişteki en fazla token sayısı. Verilmezse
+                CLASSIFIER_MAX_BATCH_TOKENS ortam değişkeni, o da yoksa 4096 kullanılır.
+            backend (str): "torch" veya "onnx". Verilmezse CLASSIFIER_BACKEND ortam değişkeni,
+                o da yoksa "torch" kullanılır. "onnx" için kontrol noktası klasöründe
+                src/utils/onnx_export.py ile üretilmiş model.onnx bulunmalıdır.
+            precision (str): "fp32", "bf16" (CPU autocast) veya "int8" (Linear katmanlarında dinamik
+                kuantizasyon). Verilmezse CLASSIFIER_PRECISION ortam değişkeni, o da yoksa "fp32" kullanılır.
+                ONNX backend'i yalnızca "fp32" destekler.
+            cache_size (int): Olasılık önbelleğindeki en fazla yorum sayısı; 0 önbelleği kapatır. Verilmezse
+                CLASSIFIER_CACHE_SIZE ortam değişkeni, o da yoksa 100000 kullanılır.
+            cache_path (str): Önbelleğin yeniden başlatmalar arasında saklanacağı JSON dosyası. Verilmezse
+                CLASSIFIER_CACHE_PATH ortam değişkeni kullanılır; o da yoksa önbellek yalnızca bellekte tutulur.
+            load_mode (str): "default" (from_pretrained) veya "mmap" (model.safetensors salt okunur belleğe
+                eşlenir; uvicorn --workers ile çalışan süreçler ağırlıkların tek kopyasını paylaşır). Verilmezse
+                CLASSIFIER_LOAD_MODE ortam değişkeni, o da yoksa "default" kullanılır. "int8" precision
+                ağırlıkları yeniden ürettiği için mmap paylaşımından yararlanamaz.
         """
         load_dotenv()
         self.model_checkpoint_path = model_checkpoint_path
+        self.batch_size = batch_size or int(os.getenv("CLASSIFIER_BATCH_SIZE", "32"))
+        self.max_batch_tokens = max_batch_tokens or int(os.getenv("CLASSIFIER_MAX_BATCH_TOKENS", "4096"))
+        self.max_length = 128
+        self.backend = backend or os.getenv("CLASSIFIER_BACKEND", "torch")
+        self.precision = precision or os.getenv("CLASSIFIER_PRECISION", "fp32")
+        if self.precision not in ("fp32", "bf16", "int8"):
+            raise ValueError(f"Desteklenmeyen precision: {self.precision}. Geçerli değerler: 'fp32', 'bf16', 'int8'.")
+        if self.backend == "onnx" and self.precision != "fp32":
+            raise ValueError("ONNX backend'i yalnızca 'fp32' precision ile kullanılabilir.")
+        self.load_mode = load_mode or os.getenv("CLASSIFIER_LOAD_MODE", "default")
+        if self.load_mode not in ("default", "mmap"):
+            raise ValueError(f"Desteklenmeyen load_mode: {self.load_mode}. Geçerli değerler: 'default', 'mmap'.")
+        # torch ve transformers ağır modüllerdir; yalnızca sınıflandırıcı oluşturulurken içe aktarılır
+        from transformers import AutoConfig, AutoTokenizer
+
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_checkpoint_path)
-        self.model = AutoModelForSequenceClassification.from_pretrained(self.model_checkpoint_path)
+        self.model = None
+        self.onnx_session = None
+
+        if self.backend == "torch":
+            import torch
+            from transformers import AutoModelForSequenceClassification
+
+            if self.load_mode == "mmap":
+                self.model = load_mmap_model(self.model_checkpoint_path)
+            else:
+                self.model = AutoModelForSequenceClassification.from_pretrained(self.model_checkpoint_path)
+            self.num_labels = self.model.config.num_labels
+            if self.precision == "int8":
+                self.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif self.backend == "onnx":
+            self.onnx_session = self._load_onnx_session()
+            self.onnx_input_names = [model_input.name for model_input in self.onnx_session.get_inputs()]
+            self.num_labels = AutoConfig.from_pretrained(self.model_checkpoint_path).num_labels
+        else:
+            raise ValueError(f"Desteklenmeyen backend: {self.backend}. Geçerli değerler: 'torch', 'onnx'.")
+
         self.categories = ["URUN_KALITESI", "PAKETLEME/TESLIMAT", "FIYAT/PERFORMANS", "URUN_TASARIMI"]
-        print("Model ve tokenizer başarıyla yüklendi.")
+
+        cache_size = cache_size if cache_size is not None else int(os.getenv("CLASSIFIER_CACHE_SIZE", "100000"))
+        cache_path = cache_path or os.getenv("CLASSIFIER_CACHE_PATH")
+        self.model_fingerprint = self._model_fingerprint()
+        self.probability_cache = LRUCache(cache_size, path=cache_path) if cache_size > 0 else None
+        if self.probability_cache is not None and cache_path:
+            atexit.register(self.save_cache)
+
+        print(f"Model ve tokenizer başarıyla yüklendi. "
+              f"(backend: {self.backend}, precision: {self.precision}, load_mode: {self.load_mode})")
+
+    def _load_onnx_session(self):
+        """
+        Kontrol noktası klasöründeki model.onnx dosyasını graf optimizasyonları açık şekilde yükler.
+
+        Returns:
+            onnxruntime.InferenceSession: Çıkarım oturumu.
+        """
+        import onnxruntime as ort
+
+        onnx_path = os.path.join(self.model_checkpoint_path, "model.onnx")
+        if not os.path.exists(onnx_path):
+            raise FileNotFoundError(
+                f"{onnx_path} bulunamadı. Lütfen önce src/utils/onnx_export.py ile modeli ONNX formatına dönüştürün.")
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        intra_op_threads = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+        if intra_op_threads:
+            session_options.intra_op_num_threads = intra_op_threads
+        return ort.InferenceSession(onnx_path, sess_options=session_options, providers=["CPUExecutionProvider"])
+
+    def _make_batches(self, lengths: list) -> list:
+        """
+        Yorumları token uzunluğuna göre sıralayıp batch_size ve max_batch_tokens sınırlarına uyan gruplara böler.
+
+        Args:
+            lengths (list): Her yorumun token uzunluğu.
+
+        Returns:
+            list: Her biri orijinal indekslerden oluşan batch listesi.
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+        batches = []
+        current = []
+        for i in order:
+            # Sıralı olduğu için batch'in dolgulu uzunluğu eklenen son yorumun uzunluğudur
+            padded_tokens = lengths[i] * (len(current) + 1)
+            if current and (len(current) >= self.batch_size or padded_tokens > self.max_batch_tokens):
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _model_fingerprint(self) -> str:
+        """
+        Önbellek anahtarlarında kullanılmak üzere modeli (yol, ağırlık dosyası, backend, precision) tanımlayan bir özet üretir.
+
+        Returns:
+            str: Model parmak izi.
+        """
+        parts = [os.path.abspath(self.model_checkpoint_path), self.backend, self.precision]
+        for file_name in ("model.safetensors", "pytorch_model.bin", "model.onnx"):
+            weights_path = os.path.join(self.model_checkpoint_path, file_name)
+            if os.path.exists(weights_path):
+                stat = os.stat(weights_path)
+                parts.append(f"{file_name}:{stat.st_size}:{int(stat.st_mtime)}")
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _cache_key(self, text: str) -> str:
+        """
+        Yorumun boşlukları normalize edilmiş hali ve model parmak izinden önbellek anahtarı üretir.
+
+        Args:
+            text (str): Yorum metni.
+
+        Returns:
+            str: Önbellek anahtarı.
+        """
+        normalized_text = re.sub(r"\s+", " ", str(text)).strip()
+        return hashlib.sha256(f"{self.model_fingerprint}\0{normalized_text}".encode("utf-8")).hexdigest()
+
+    def save_cache(self) -> None:
+        """
+        Olasılık önbelleğini (cache_path tanımlıysa) diske yazar.
+        """
+        if self.probability_cache is not None:
+            self.probability_cache.save()
+
+    def predict_probabilities(self, review_list: list) -> np.ndarray:
+        """
+        Yorumların kategori olasılıklarını döner.
+
+        Aynı çağrıdaki tekrar eden yorumlar bir kez hesaplanır; daha önce hesaplanmış yorumlar
+        önbellekten gelir. Eşik değeri uygulanmadığı için önbellek farklı eşiklerle yeniden kullanılabilir.
+
+        Args:
+            review_list (list): Yorumların listesi.
+
+        Returns:
+            np.ndarray: [yorum sayısı, kategori sayısı] boyutunda, orijinal sırayla sigmoid olasılıkları.
+        """
+        probabilities = np.zeros((len(review_list), self.num_labels), dtype=np.float32)
+
+        # Önbellekte olmayan yorumları tekilleştir: anahtar -> (metin, indeksler)
+        missing = {}
+        for i, text in enumerate(review_list):
+            key = self._cache_key(text)
+            cached = self.probability_cache.get(key) if self.probability_cache is not None else None
+            if cached is not None:
+                probabilities[i] = cached
+            else:
+                missing.setdefault(key, (text, []))[1].append(i)
+
+        if self.probability_cache is not None:
+            record_cache("classifier", hits=len(review_list) - sum(len(indices) for _, indices in missing.values()),
+                         misses=len(missing))
+
+        if missing:
+            computed = self._compute_probabilities([text for text, _ in missing.values()])
+            for (key, (_, indices)), row in zip(missing.items(), computed):
+                probabilities[indices] = row
+                if self.probability_cache is not None:
+                    self.probability_cache.put(key, row.tolist())
+
+        return probabilities
+
+    def _compute_probabilities(self, review_list: list) -> np.ndarray:
+        """
+        Yorumların kategori olasılıklarını uzunluğa göre gruplanmış batch'ler halinde hesaplar.
+
+        Dolgu yalnızca her batch içinde yapılır, böylece bellek kullanımı yorum sayısından bağımsız kalır.
+
+        Args:
+            review_list (list): Yorumların listesi.
+
+        Returns:
+            np.ndarray: [yorum sayısı, kategori sayısı] boyutunda, orijinal sırayla sigmoid olasılıkları.
+        """
+        with stage_timer("tokenization"):
+            encodings = self.tokenizer(review_list, truncation=True, max_length=self.max_length)
+        lengths = [len(input_ids) for input_ids in encodings["input_ids"]]
+        probabilities = np.zeros((len(review_list), self.num_labels), dtype=np.float32)
+
+        for batch_indices in self._make_batches(lengths):
+            features = [{key: encodings[key][i] for key in encodings.keys()} for i in batch_indices]
+            probabilities[batch_indices] = self._forward(features)
+
+        return probabilities
+
+    def _forward(self, features: list) -> np.ndarray:
+        """
+        Tek bir batch'i seçili backend ile çalıştırır ve sigmoid olasılıklarını döner.
+
+        Args:
+            features (list): Tokenizer çıktısı olan, dolgusuz örneklerin listesi.
+
+        Returns:
+            np.ndarray: Batch'in sigmoid olasılıkları.
+        """
+        if self.backend == "onnx":
+            with stage_timer("tokenization"):
+                batch = self.tokenizer.pad(features, padding=True, return_tensors="np")
+                inputs = {name: batch[name].astype(np.int64) for name in self.onnx_input_names}
+            with stage_timer("forward"):
+                logits = self.onnx_session.run(None, inputs)[0]
+            return 1 / (1 + np.exp(-logits))
+
+        import torch
+
+        with stage_timer("tokenization"):
+            batch = self.tokenizer.pad(features, padding=True, return_tensors="pt")
+        with stage_timer("forward"), torch.no_grad(), \
+                torch.autocast("cpu", dtype=torch.bfloat16, enabled=self.precision == "bf16"):
+            outputs = self.model(**batch)
+        return torch.sigmoid(outputs.logits.float()).numpy()
 
     def classify_reviews(self, review_list: list, threshold: float = 0.5) -> list:
         """
@@ -40,18 +314,24 @@ class ReviewClassifier:
         Returns:
             list: Her yorumun sınıflandırma sonuçlarını içeren liste.
         """
+        if not review_list:
+            return []
+
+        predictions = self.predict_probabilities(review_list)
+        return self.apply_threshold(review_list, predictions, threshold)
 
-        encoded_inputs = self.tokenizer(
-            review_list,
-            truncation=True,
-            padding=True,
-            max_length=128,
-            return_tensors="pt"
-        )
-        with torch.no_grad():
-            outputs = self.model(**encoded_inputs)
-            predictions = torch.sigmoid(outputs.logits).numpy()
+    def apply_threshold(self, review_list: list, predictions: np.ndarray, threshold: float = 0.5) -> list:
+        """
+        Olasılıkları eşik değerine göre kategorilere dönüştürür.
+
+        Args:
+            review_list (list): Yorumların listesi.
+            predictions (np.ndarray): predict_probabilities çıktısı.
+            threshold (float): Sınıflandırma için eşik değeri. Varsayılan olarak 0.5.
 
+        Returns:
+            list: Her yorumun sınıflandırma sonuçlarını içeren liste.
+        """
         classification_results = []
         for i, prediction in enumerate(predictions):
             classified_categories = [
@@ -64,3 +344,20 @@ class ReviewClassifier:
             })
         return classification_results
 
+    def classify_review_stream(self, review_pages, threshold: float = 0.5, batch_size: int = 32):
+        """
+        Sayfa sayfa gelen yorumları mikro-batch'ler halinde sınıflandıran bir generator.
+
+        Yorumlar batch_size kadar biriktiğinde sınıflandırılır; böylece yorum çekme işlemi
+        devam ederken sınıflandırma da yürütülür. Sonuçlar yorumların geliş sırasını korur.
+
+        Args:
+            review_pages (iterable): Her elemanı bir yorum listesi olan yinelenebilir nesne
+                (örneğin AmazonAPI.iter_amazon_reviews).
+            threshold (float): Sınıflandırma için eşik değeri. Varsayılan olarak 0.5.
+            batch_size (int): Bir seferde sınıflandırılacak yorum sayısı. Varsayılan olarak 32.
+
+        Yields:
+            list: Bir mikro-batch'e ait sınıflandırma sonuçları.
+        """
+        yield from classify_in_batches(self.classify_reviews, review_pages, threshold, batch_size)
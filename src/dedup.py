@@ -0,0 +1,232 @@
+import os
+import re
+import zlib
+import unicodedata
+import numpy as np
+from metrics import stage_timer
+
+# MinHash permütasyonlarında kullanılan Mersenne asalı (2^61 - 1)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+# Türkçe karakterler ASCII karşılıklarına indirgenir; "çok güzel" ile "cok guzel" aynı yorum sayılır
+_TURKISH_FOLD = str.maketrans({"ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u", "â": "a", "î": "i", "û": "u"})
+
+
+def normalize_turkish(text: str) -> str:
+    """
+    Yorumu yakın kopya karşılaştırması için normalize eder: Türkçe kurallarına göre küçük harfe çevirir
+    (I -> ı, İ -> i), Türkçe karakterleri sadeleştirir, noktalama ve emojileri atar, üç ve daha fazla tekrar
+    eden harfleri ("çoooook") teke indirir ve boşlukları tekleştirir.
+
+    Args:
+        text (str): Yorum metni.
+
+    Returns:
+        str: Normalize edilmiş metin.
+    """
+    text = unicodedata.normalize("NFC", text).replace("I", "ı").replace("İ", "i").lower()
+    text = text.translate(_TURKISH_FOLD)
+    text = re.sub(r"[^\w\s]|_", " ", text)
+    text = re.sub(r"(\w)\1{2,}", r"\1", text)
+    return " ".join(text.split())
+
+
+class ReviewDeduplicator:
+    """
+    ReviewDeduplicator, birbirinin kopyası ya da çok benzeri olan yorumları tek bir kümede toplayan bir sınıftır.
+
+    Yorumlar normalize edildikten sonra karakter n-gram'larının (shingle) MinHash imzası çıkarılır; LSH bantları
+    ile yalnızca aday küme temsilcileriyle karşılaştırılır. Tahmini Jaccard benzerliği threshold'u aşan yorum
+    en benzer temsilcinin kümesine eklenir, aşmazsa yeni bir kümenin temsilcisi olur. Yorumlar geldikçe
+    kümelendiği için sayfa sayfa gelen yorum akışına uygulanabilir: yalnızca temsilciler sınıflandırılır.
+
+    Her analiz için yeni bir nesne oluşturulmalıdır; küme bilgileri nesnede tutulur.
+
+    Attributes:
+        threshold (float): Aynı kümeye girmek için gereken en küçük tahmini Jaccard benzerliği.
+        num_perm (int): MinHash imzasının uzunluğu.
+        bands (int): LSH bant sayısı; num_perm'i tam bölmelidir.
+        shingle_size (int): Karakter n-gram uzunluğu.
+
+    Methods:
+        add(review): Yorumu kümeler; yeni bir kümenin temsilcisiyse True döner.
+        dedupe_stream(review_pages): Sayfa sayfa gelen yorumlardan yalnızca temsilcileri üretir.
+        count(review): Temsilcinin kümesindeki yorum sayısını döner.
+        label(review): Temsilciyi özet istemi için küme büyüklüğüyle etiketler.
+        attach_counts(classified_reviews): Sınıflandırma sonuçlarına küme büyüklüklerini ekler.
+        expand(classified_reviews): Temsilcilerin sonuçlarını kümelerdeki her yoruma uygular.
+    """
+
+    def __init__(self, threshold: float = None, num_perm: int = 64, bands: int = 16, shingle_size: int = 5,
+                 seed: int = 1) -> None:
+        """
+        Args:
+            threshold (float): Verilmezse DEDUP_THRESHOLD ortam değişkeni, o da yoksa 0.8 kullanılır.
+            num_perm (int): MinHash imzasının uzunluğu. Varsayılan olarak 64.
+            bands (int): LSH bant sayısı. Varsayılan olarak 16 (bant başına 4 satır).
+            shingle_size (int): Karakter n-gram uzunluğu. Varsayılan olarak 5.
+            seed (int): Permütasyon parametreleri için tohum; aynı tohum aynı imzaları üretir.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm, bands değerine tam bölünmelidir.")
+        self.threshold = threshold if threshold is not None else float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # a * x + b çarpımı 64 bit'e sığsın diye katsayılar ve shingle hash'leri 32 bit'tir
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._rows = num_perm // bands
+        self._exact = {}         # normalize metin -> temsilci
+        self._buckets = {}       # (bant, bant imzası) -> temsilci listesi
+        self._signatures = {}    # temsilci -> MinHash imzası
+        self._counts = {}        # temsilci -> küme büyüklüğü
+        self._members = []       # geliş sırasıyla (yorum, temsilci)
+
+    def _shingles(self, normalized: str) -> set:
+        if len(normalized) <= self.shingle_size:
+            return {normalized}
+        return {normalized[i:i + self.shingle_size] for i in range(len(normalized) - self.shingle_size + 1)}
+
+    def _signature(self, normalized: str) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in self._shingles(normalized)), dtype=np.uint64)
+        return ((np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME).min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        return [(band, signature[band * self._rows:(band + 1) * self._rows].tobytes()) for band in range(self.bands)]
+
+    def add(self, review: str) -> bool:
+        """
+        Yorumu mevcut kümelerle karşılaştırır ve uygun kümeye ekler.
+
+        Args:
+            review (str): Yorum metni.
+
+        Returns:
+            bool: Yorum yeni bir kümenin temsilcisiyse True, mevcut bir kümeye eklendiyse False.
+        """
+        normalized = normalize_turkish(review)
+        representative = self._exact.get(normalized)
+        if representative is None and normalized:
+            signature = self._signature(normalized)
+            band_keys = self._band_keys(signature)
+            candidates = list({candidate for key in band_keys for candidate in self._buckets.get(key, ())})
+            if candidates:
+                # Tahmini Jaccard benzerliği: imzaların eşit olan bileşenlerinin oranı
+                similarities = (np.stack([self._signatures[c] for c in candidates]) == signature).mean(axis=1)
+                best = int(similarities.argmax())
+                if similarities[best] >= self.threshold:
+                    representative = candidates[best]
+            if representative is None:
+                self._signatures[review] = signature
+                for key in band_keys:
+                    self._buckets.setdefault(key, []).append(review)
+            self._exact[normalized] = representative or review
+
+        # Normalize hali boş olan yorumlar (ör. yalnızca emoji) yalnızca birebir aynılarıyla birleşir
+        representative = representative or review
+        is_new = representative not in self._counts
+        self._counts[representative] = self._counts.get(representative, 0) + 1
+        self._members.append((review, representative))
+        return is_new
+
+    def dedupe_stream(self, review_pages):
+        """
+        Sayfa sayfa gelen yorumları kümeler ve her sayfadan yalnızca yeni küme temsilcilerini üretir.
+
+        Args:
+            review_pages (iterable): Her elemanı bir yorum listesi olan yinelenebilir nesne.
+
+        Yields:
+            list: Sayfadaki yeni temsilciler (boş sayfalar atlanır).
+        """
+        for page_reviews in review_pages:
+            with stage_timer("deduplication"):
+                representatives = [review for review in page_reviews if self.add(review)]
+            if representatives:
+                yield representatives
+
+    def count(self, review: str) -> int:
+        """
+        Temsilcinin kümesindeki yorum sayısını döner; kümelenmemiş yorumlar için 1 döner.
+        """
+        return self._counts.get(review, 1)
+
+    def label(self, review: str) -> str:
+        """
+        Birden çok yorumu temsil eden yorumu özet isteminde "yorum (xN)" biçiminde etiketler.
+        """
+        return label_review(review, self.count(review))
+
+    def attach_counts(self, classified_reviews: list) -> list:
+        """
+        Temsilcilerin sınıflandırma sonuçlarına "count" alanını (küme büyüklüğü) ekler.
+
+        Args:
+            classified_reviews (list): Temsilcilerin sınıflandırma sonuçları.
+
+        Returns:
+            list: Aynı liste.
+        """
+        for item in classified_reviews:
+            item["count"] = self.count(item["review"])
+        return classified_reviews
+
+    def expand(self, classified_reviews: list) -> list:
+        """
+        Temsilcilerin sınıflandırma sonuçlarını kümelerindeki her yoruma uygular; yorumlar geliş sırasıyla,
+        her biri ayrı bir sonuç olarak döner.
+
+        Args:
+            classified_reviews (list): Temsilcilerin sınıflandırma sonuçları.
+
+        Returns:
+            list: Kümelenen tüm yorumların sınıflandırma sonuçları.
+        """
+        results = {item["review"]: item for item in classified_reviews}
+        return [
+            {**results[representative], "review": review}
+            for review, representative in self._members
+            if representative in results
+        ]
+
+    @property
+    def total_reviews(self) -> int:
+        return sum(self._counts.values())
+
+    @property
+    def unique_reviews(self) -> int:
+        return len(self._counts)
+
+
+def dedup_enabled() -> bool:
+    """
+    REVIEW_DEDUP ortam değişkeni "0" değilse yakın kopya birleştirme etkindir.
+    """
+    return os.getenv("REVIEW_DEDUP", "1").lower() not in ("0", "false", "no")
+
+
+def label_review(review: str, count: int = 1) -> str:
+    """
+    Birden çok yorumu temsil eden yorumu "yorum (xN)" biçiminde etiketler; özet isteminde kümenin
+    ağırlığı böyle görünür.
+    """
+    return f"{review} (x{count})" if count > 1 else review
+
+
+def weighted_category_counts(classified_reviews: list) -> dict:
+    """
+    Kategori başına yorum sayısını, her temsilciyi küme büyüklüğü ("count") kadar sayarak hesaplar.
+
+    Args:
+        classified_reviews (list): Sınıflandırma sonuçları.
+
+    Returns:
+        dict: Kategori -> yorum sayısı.
+    """
+    counts = {}
+    for item in classified_reviews:
+        for kategori in item["categories"]:
+            counts[kategori] = counts.get(kategori, 0) + item.get("count", 1)
+    return counts
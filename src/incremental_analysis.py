@@ -0,0 +1,129 @@
+import os
+
+
+class IncrementalAnalyzer:
+    """
+    IncrementalAnalyzer, bir ürünü yeniden analiz ederken yalnızca daha önce görülmemiş yorumları sınıflandıran
+    ve özeti yalnızca kategori dağılımı anlamlı ölçüde değiştiğinde yeniden üreten bir sınıftır.
+
+    Sınıflandırma sonuçları ve kategori sayıları ReviewStore'da ürün bazında saklanır. Yorumlar AmazonAPI
+    üzerinden alındığı için önbellek eskimişse yalnızca en yeni sayfalar çekilir. Yalnızca önbelleğe yazılmış
+    yorumlar sınıflandırılır; sayfaları eksik alınan (önbelleğe yazılmayan) yorumlar sonraki çalıştırmaya kalır,
+    böylece kategori sayıları ile saklanan yorumlar her zaman tutarlıdır.
+
+    Attributes:
+        amazon_api (AmazonAPI): Yorumları çeken nesne; review_store tanımlı olmalıdır.
+        summarizer (ReviewSummarizer): Özetleyici.
+        change_threshold (float): Yeniden özetleme için gereken en küçük kategori dağılımı değişimi.
+
+    Methods:
+        analyze(asin, review_classifier): Ürünü artımlı olarak analiz eder.
+        category_mix_change(old_counts, new_counts): İki kategori dağılımı arasındaki farkı döner.
+    """
+
+    def __init__(self, amazon_api, summarizer, change_threshold: float = None) -> None:
+        """
+        Args:
+            amazon_api (AmazonAPI): Yorumları çeken nesne.
+            summarizer (ReviewSummarizer): Özetleyici.
+            change_threshold (float): Kategori paylarındaki toplam değişim (0-1 arası) bu değeri aşarsa özet
+                yeniden üretilir. Verilmezse INCREMENTAL_CHANGE_THRESHOLD ortam değişkeni, o da yoksa 0.05 kullanılır.
+        """
+        if amazon_api.review_store is None:
+            raise ValueError("Artımlı analiz için AmazonAPI bir ReviewStore ile oluşturulmalıdır.")
+        self.amazon_api = amazon_api
+        self.review_store = amazon_api.review_store
+        self.summarizer = summarizer
+        self.change_threshold = change_threshold if change_threshold is not None else float(
+            os.getenv("INCREMENTAL_CHANGE_THRESHOLD", "0.05"))
+
+    @staticmethod
+    def category_mix_change(old_counts: dict, new_counts: dict) -> float:
+        """
+        İki kategori dağılımı arasındaki toplam değişim mesafesini (total variation distance) hesaplar.
+
+        Args:
+            old_counts (dict): Önceki kategori sayıları.
+            new_counts (dict): Güncel kategori sayıları.
+
+        Returns:
+            float: 0 (aynı dağılım) ile 1 (tamamen farklı) arasında bir değer.
+        """
+        old_total = sum(old_counts.values())
+        new_total = sum(new_counts.values())
+        if not old_total or not new_total:
+            return 0.0 if old_total == new_total else 1.0
+        categories = set(old_counts) | set(new_counts)
+        return sum(abs(old_counts.get(c, 0) / old_total - new_counts.get(c, 0) / new_total) for c in categories) / 2
+
+    def analyze(self, asin: str, review_classifier, threshold: float = 0.5) -> dict:
+        """
+        Ürünü artımlı olarak analiz eder.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            review_classifier: Yeni yorumları sınıflandıracak nesne (ReviewClassifier ya da DynamicBatcher).
+            threshold (float): Sınıflandırma için eşik değeri. Varsayılan olarak 0.5.
+
+        Returns:
+            dict: conclusion, categories, category_counts, new_reviews ve resummarized alanları;
+                işlem başarısızsa message alanı.
+        """
+        records = {}
+        for page_records in self.amazon_api.iter_review_records(asin):
+            for record in page_records:
+                records.setdefault(record["review_id"], record)
+        if not records:
+            return {"message": "Yorumlar alınamadı. İşlem sonlandırıldı."}
+
+        # Sayfalardan biri alınamadıysa yorumlar önbelleğe yazılmaz; saklanmayan yorumların sınıflandırması
+        # kategori sayılarına girse de özetlenecek yorumlar arasında görünmezdi
+        stored_ids = self.review_store.get_review_ids(asin)
+        if not stored_ids:
+            return {"message": "Yorumların tamamı alınamadığı için artımlı analiz yapılamadı. Lütfen tekrar deneyin."}
+        unstored = sum(1 for review_id in records if review_id not in stored_ids)
+        if unstored:
+            print(f"{asin}: Önbelleğe yazılamayan {unstored} yorum sonraki analize bırakıldı.")
+
+        # DynamicBatcher kendi sınıflandırıcısını sarar; model parmak izi sınıflandırıcıdadır
+        model_fingerprint = getattr(review_classifier, "classifier", review_classifier).model_fingerprint
+        classified_ids = self.review_store.get_classified_ids(asin, model_fingerprint)
+        new_records = [record for review_id, record in records.items()
+                       if review_id in stored_ids and review_id not in classified_ids]
+
+        if new_records:
+            print(f"{asin}: {len(new_records)} yeni yorum sınıflandırılıyor...")
+            results = review_classifier.classify_reviews(
+                [record["review_comment"] for record in new_records], threshold=threshold)
+            analysis = self.review_store.save_classifications(
+                asin, model_fingerprint,
+                [(record["review_id"], result["categories"]) for record, result in zip(new_records, results)]
+            )
+        else:
+            print(f"{asin}: Yeni yorum yok, saklanan sınıflandırmalar kullanılıyor.")
+            analysis = self.review_store.get_analysis(asin)
+
+        kategori_yorumlari = self.review_store.get_categorized_reviews(asin)
+        category_counts = analysis["category_counts"]
+        if not kategori_yorumlari:
+            # Boş kategorilerden üretilen özet saklanmaz ve önceki özet de kullanılmaz
+            return {"message": "Özetlenecek kategorize yorum bulunamadı.", "category_counts": category_counts,
+                    "new_reviews": len(new_records)}
+        summary = analysis["summary"]
+        resummarize = not summary or self.category_mix_change(
+            analysis["summary_counts"] or {}, category_counts) > self.change_threshold
+
+        if resummarize:
+            print(f"{asin}: Kategori dağılımı değişti, yorumlar yeniden özetleniyor...")
+            summary = self.summarizer.summarize_reviews(kategori_yorumlari)
+            if not summary:
+                return {"message": "Özetleme işlemi başarısız oldu."}
+            self.review_store.save_summary(asin, summary, category_counts)
+
+        return {
+            "conclusion": summary,
+            "categories": kategori_yorumlari,
+            "category_counts": category_counts,
+            "new_reviews": len(new_records),
+            "resummarized": resummarize
+        }
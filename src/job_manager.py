@@ -0,0 +1,121 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFullError(Exception):
+    """
+    İş kuyruğu dolu olduğunda yeni iş kabul edilemediğini belirten hata.
+    """
+
+
+class JobManager:
+    """
+    JobManager, uzun süren analizleri arka planda sınırlı sayıda işçiyle çalıştıran bir iş yöneticisidir.
+
+    Her iş bir kimlik alır; iş çalışırken hangi aşamada olduğu, bittiğinde sonucu ya da hatası saklanır.
+    Kuyruk derinliği sınırlıdır; sınır aşıldığında yeni iş reddedilir, böylece yavaş bir ürün diğer
+    istekleri süresiz bekletemez.
+
+    Attributes:
+        max_workers (int): Aynı anda çalışabilecek iş sayısı.
+        max_queue (int): Çalışmayı bekleyebilecek en fazla iş sayısı.
+        result_ttl (int): Biten işlerin sonuçlarının saklanacağı süre (saniye).
+
+    Methods:
+        submit(fn, *args): İşi kuyruğa ekler ve iş kimliğini döner.
+        get(job_id): İşin durumunu döner.
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = None, result_ttl: int = None) -> None:
+        """
+        Args:
+            max_workers (int): Verilmezse JOB_WORKERS ortam değişkeni, o da yoksa 4 kullanılır.
+            max_queue (int): Verilmezse JOB_QUEUE_SIZE ortam değişkeni, o da yoksa 32 kullanılır.
+            result_ttl (int): Verilmezse JOB_RESULT_TTL ortam değişkeni, o da yoksa 3600 kullanılır.
+        """
+        self.max_workers = max_workers or int(os.getenv("JOB_WORKERS", "4"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("JOB_QUEUE_SIZE", "32"))
+        self.result_ttl = result_ttl or int(os.getenv("JOB_RESULT_TTL", "3600"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job-worker")
+        self._jobs = {}
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> str:
+        """
+        İşi kuyruğa ekler. fn, args ile birlikte son argüman olarak bir progress(stage) fonksiyonu alır.
+
+        Args:
+            fn (callable): Çalıştırılacak fonksiyon.
+            *args: Fonksiyona verilecek argümanlar.
+
+        Returns:
+            str: İş kimliği.
+
+        Raises:
+            JobQueueFullError: Çalışan ve bekleyen iş sayısı sınıra ulaştıysa.
+        """
+        with self._lock:
+            self._evict_expired()
+            if self._active >= self.max_workers + self.max_queue:
+                raise JobQueueFullError("İş kuyruğu dolu. Lütfen daha sonra tekrar deneyin.")
+            self._active += 1
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "status": "queued",
+                "stage": None,
+                "created_at": now,
+                "updated_at": now,
+                "result": None,
+                "error": None
+            }
+
+        self._executor.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def get(self, job_id: str) -> dict:
+        """
+        İşin durumunu döner.
+
+        Args:
+            job_id (str): İş kimliği.
+
+        Returns:
+            dict: İşin durumu, aşaması, sonucu ve hatası. İş bulunamazsa None.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields, updated_at=time.time())
+
+    def _run(self, job_id: str, fn, args: tuple) -> None:
+        self._update(job_id, status="running")
+        try:
+            result = fn(*args, lambda stage: self._update(job_id, stage=stage))
+            self._update(job_id, status="done", stage="done", result=result)
+        except Exception as e:
+            print(f"{job_id} işi sırasında bir hata oluştu: {str(e)}")
+            self._update(job_id, status="failed", error=str(e))
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _evict_expired(self) -> None:
+        """
+        Süresi dolmuş, tamamlanmış işleri siler. Kilit altında çağrılmalıdır.
+        """
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in ("done", "failed") and now - job["updated_at"] > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
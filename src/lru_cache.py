@@ -0,0 +1,109 @@
+import os
+import json
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    LRUCache, boyutu sınırlı, iş parçacığı güvenli ve isteğe bağlı olarak diske kaydedilebilen bir önbellektir.
+
+    En uzun süredir kullanılmayan kayıt, önbellek dolduğunda ilk silinen kayıttır.
+    Değerler diske JSON olarak yazıldığı için JSON'a dönüştürülebilir olmalıdır.
+
+    Attributes:
+        max_size (int): Önbellekte tutulacak en fazla kayıt sayısı.
+        path (str): Önbelleğin kaydedileceği JSON dosyasının yolu (opsiyonel).
+
+    Methods:
+        get(key): Anahtara ait değeri döner, yoksa None döner.
+        put(key, value): Anahtara değer atar, gerekirse en eski kaydı siler.
+        load(): Önbelleği diskten okur.
+        save(): Önbelleği diske yazar.
+    """
+
+    def __init__(self, max_size: int, path: str = None) -> None:
+        """
+        Args:
+            max_size (int): Önbellekte tutulacak en fazla kayıt sayısı.
+            path (str): Önbelleğin kaydedileceği JSON dosyasının yolu. Verilirse ve dosya varsa yüklenir.
+        """
+        self.max_size = max_size
+        self.path = path
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        if self.path and os.path.exists(self.path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str):
+        """
+        Anahtara ait değeri döner ve kaydı en son kullanılan olarak işaretler.
+
+        Args:
+            key (str): Önbellek anahtarı.
+
+        Returns:
+            Kayıtlı değer, yoksa None.
+        """
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: str, value) -> None:
+        """
+        Anahtara değer atar; önbellek doluysa en uzun süredir kullanılmayan kaydı siler.
+
+        Args:
+            key (str): Önbellek anahtarı.
+            value: Saklanacak değer.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def load(self) -> None:
+        """
+        Önbelleği diskten okur. Dosya bozuksa önbellek boş başlar.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Önbellek dosyası okunamadı ({self.path}): {str(e)}")
+            return
+
+        with self._lock:
+            self._data = OrderedDict(items[-self.max_size:] if self.max_size else [])
+
+    def save(self) -> None:
+        """
+        Önbelleği, yarım yazılmış dosya oluşmaması için önce geçici dosyaya yazıp sonra yerine taşır.
+        """
+        if not self.path:
+            return
+
+        # Eşzamanlı kayıtlar sırayla yapılır; her kayıt kendi geçici dosyasına yazar
+        with self._save_lock:
+            with self._lock:
+                items = list(self._data.items())
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(self.path)}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(items, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
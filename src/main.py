@@ -1,72 +1,173 @@
 import sys
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_path = os.path.join(current_dir, 'src')
 sys.path.append(src_path)
 
 from amazon_api import AmazonAPI
+from review_store import ReviewStore
 from classification import ReviewClassifier
 from summarization import ReviewSummarizer
+from batch_scheduler import DynamicBatcher
+from incremental_analysis import IncrementalAnalyzer
+from dedup import ReviewDeduplicator, dedup_enabled, label_review, weighted_category_counts
 
 class MainApp:
     """
     MainApp, Amazon ürün yorumlarını çekme, sınıflandırma ve özetleme işlemlerini gerçekleştiren sınıftır.
 
     Methods:
-        run(asin): Verilen ASIN koduna göre tüm işlemleri yürütür.
+        analyze(asin, review_classifier): Verilen ASIN koduna göre tüm işlemleri yürütür ve sonucu döner.
+        run(asin, incremental): Verilen ASIN koduna göre tüm işlemleri (isteğe bağlı artımlı) yürütür ve özeti yazdırır.
+        run_batch(asins): Birden çok ürünü eşzamanlı analiz eder, sonuçları tamamlandıkça döner.
+        start_warm_up(): Sınıflandırma modelini arka planda yüklemeye başlar.
     """
 
     def __init__(self, model_checkpoint_path) -> None:
         """
         MainApp sınıfını başlatır ve gerekli sınıf örneklerini oluşturur.
+        Sınıflandırma modeli ilk kullanıldığında (ya da start_warm_up ile arka planda) yüklenir.
         """
-        self.amazon_api = AmazonAPI()
-        self.classifier = ReviewClassifier(model_checkpoint_path)
+        self.model_checkpoint_path = model_checkpoint_path
+        self.amazon_api = AmazonAPI(review_store=ReviewStore())
         self.summarizer = ReviewSummarizer()
+        self.incremental_analyzer = IncrementalAnalyzer(self.amazon_api, self.summarizer)
         self.categories = ["URUN_KALITESI", "PAKETLEME/TESLIMAT", "FIYAT/PERFORMANS", "URUN_TASARIMI"]
+        self._classifier = None
+        self._classifier_lock = threading.Lock()
 
-    def run(self, asin: str) -> None:
+    @property
+    def classifier(self) -> ReviewClassifier:
+        """
+        Sınıflandırıcıyı ilk erişimde yükler; eşzamanlı erişimlerde model yalnızca bir kez yüklenir.
+        """
+        with self._classifier_lock:
+            if self._classifier is None:
+                self._classifier = ReviewClassifier(self.model_checkpoint_path)
+            return self._classifier
+
+    def start_warm_up(self) -> threading.Thread:
+        """
+        Kullanıcı ürün linkini girerken modeli arka planda yükler.
+
+        Returns:
+            threading.Thread: Yüklemeyi yapan iş parçacığı.
+        """
+        thread = threading.Thread(target=lambda: self.classifier, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def analyze(self, asin: str, review_classifier=None, budget: dict = None) -> dict:
         """
         Verilen ASIN koduna göre Amazon'dan yorumları çekme, sınıflandırma ve özetleme işlemlerini gerçekleştirir.
 
         Args:
             asin (str): Ürüne ait ASIN kodu.
+            review_classifier: Sınıflandırmada kullanılacak nesne (ReviewClassifier ya da DynamicBatcher).
+                Verilmezse self.classifier kullanılır.
+            budget (dict): Yorum bütçesi; max_reviews, max_pages ve strategy ("top", "stratified", "recent")
+                alanları AmazonAPI.iter_amazon_reviews'a aktarılır. Verilmezse tüm yorumlar çekilir.
+
+        Returns:
+            dict: asin, conclusion, categories, category_counts (yakın kopyalar dahil ağırlıklı), sampled_reviews,
+                unique_reviews ve total_reviews alanları; işlem başarısızsa asin ve message alanları.
         """
-        # 1. Amazon yorumlarını çekme
-        print("Yorumlar çekiliyor...")
-        reviews = self.amazon_api.get_amazon_reviews(asin)
-        if not reviews:
-            print("Yorumlar alınamadı. İşlem sonlandırıldı.")
-            return
-        print("Yorumlar başarıyla çekildi.")
-
-        # 2. Yorumları sınıflandırma
-        print("Yorumlar sınıflandırılıyor...")
+        review_classifier = review_classifier or self.classifier
+
+        # 1-2. Amazon yorumlarını çekme ve sınıflandırma
+        # Sayfalar indikçe mikro-batch'ler halinde sınıflandırılır, ağ ve işlemci aynı anda çalışır.
+        print(f"{asin}: Yorumlar çekiliyor ve sınıflandırılıyor...")
         self.classifier.categories = self.categories  # Kategorileri sınıflandırıcıya aktarma
-        classified_reviews = self.classifier.classify_reviews(reviews, threshold=0.5)
+        stats = {}
+        review_pages = self.amazon_api.iter_amazon_reviews(asin, stats=stats, **(budget or {}))
+        # Yakın kopya yorumlar kümelenir; her kümeden yalnızca bir yorum sınıflandırılır
+        deduplicator = ReviewDeduplicator() if dedup_enabled() else None
+        if deduplicator is not None:
+            review_pages = deduplicator.dedupe_stream(review_pages)
+        classified_reviews = []
+        for batch_results in review_classifier.classify_review_stream(review_pages, threshold=0.5):
+            classified_reviews.extend(batch_results)
         if not classified_reviews:
-            print("Sınıflandırma sonuçları alınamadı. İşlem sonlandırıldı.")
-            return
-        print("Yorumlar başarıyla sınıflandırıldı.")
+            return {"asin": asin, "message": "Yorumlar alınamadı. İşlem sonlandırıldı."}
+        if deduplicator is not None:
+            deduplicator.attach_counts(classified_reviews)
+        print(f"{asin}: {stats['sampled_reviews']} yorum çekildi, yakın kopyalar birleştirildikten sonra kalan "
+              f"{len(classified_reviews)} yorum sınıflandırıldı (toplam {stats.get('total_reviews')} yorum).")
 
-        # 3. Yorumları kategori bazında grupla
-        print("Yorumlar kategorilere göre gruplanıyor...")
+        # 3. Yorumları kategori bazında grupla; birden çok yorumu temsil eden yorumlar "(xN)" ile etiketlenir
         kategori_yorumlari = {}
         for item in classified_reviews:
+            review = label_review(item["review"], item.get("count", 1))
             for kategori in item["categories"]:
-                kategori_yorumlari.setdefault(kategori, []).append(item["review"])
-        print("Yorumlar kategorilere göre başarıyla gruplanmıştır.")
+                kategori_yorumlari.setdefault(kategori, []).append(review)
+        print(f"{asin}: Yorumlar kategorilere göre başarıyla gruplanmıştır.")
 
         # 4. Özetleme işlemi
-        print("Yorumlar özetleniyor...")
+        print(f"{asin}: Yorumlar özetleniyor...")
         summary = self.summarizer.summarize_reviews(kategori_yorumlari)
-        if summary:
+        if not summary:
+            return {"asin": asin, "message": "Özetleme işlemi başarısız oldu."}
+        return {"asin": asin, "conclusion": summary, "categories": kategori_yorumlari,
+                "category_counts": weighted_category_counts(classified_reviews),
+                "sampled_reviews": stats["sampled_reviews"], "unique_reviews": len(classified_reviews),
+                "total_reviews": stats.get("total_reviews")}
+
+    def run(self, asin: str, incremental: bool = False) -> None:
+        """
+        Verilen ASIN koduna göre analizi çalıştırır ve sonucu yazdırır.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            incremental (bool): True ise yalnızca daha önce görülmemiş yorumlar sınıflandırılır ve özet yalnızca
+                kategori dağılımı anlamlı ölçüde değiştiyse yeniden üretilir. Varsayılan olarak False.
+        """
+        if incremental:
+            self.classifier.categories = self.categories
+            result = self.incremental_analyzer.analyze(asin, self.classifier)
+            if "conclusion" in result:
+                print(f"{result['new_reviews']} yeni yorum sınıflandırıldı. Kategori sayıları: {result['category_counts']}")
+                if not result["resummarized"]:
+                    print("Kategori dağılımı anlamlı ölçüde değişmediği için önceki özet kullanıldı.")
+        else:
+            result = self.analyze(asin)
+        if "conclusion" in result:
             print("Yorumların Özeti:")
-            print(summary)
+            print(result["conclusion"])
         else:
-            print("Özetleme işlemi başarısız oldu.")
+            print(result["message"])
+
+    def run_batch(self, asins: list, max_concurrency: int = None):
+        """
+        Birden çok ürünü eşzamanlı analiz eder; her ürünün sonucu tamamlandığı anda döner.
+
+        Ürünlerin yorumları eşzamanlı çekilir, sınıflandırmada ortak bir DynamicBatcher üzerinden aynı
+        ileri geçişlerde toplanır ve özetler paralel üretilir.
+
+        Args:
+            asins (list): ASIN kodlarının listesi. Tekrar eden kodlar bir kez analiz edilir.
+            max_concurrency (int): Aynı anda analiz edilecek en fazla ürün sayısı. Verilmezse
+                BATCH_MAX_CONCURRENCY ortam değişkeni, o da yoksa 4 kullanılır.
+
+        Yields:
+            dict: Tamamlanan ürünün analiz sonucu (analyze çıktısı).
+        """
+        max_concurrency = max_concurrency or int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+        batcher = DynamicBatcher(self.classifier)
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="batch-product")
+        try:
+            futures = {executor.submit(self.analyze, asin, batcher): asin for asin in dict.fromkeys(asins)}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield {"asin": futures[future], "message": f"Analiz sırasında bir hata oluştu: {str(e)}"}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            batcher.shutdown()
 
     def get_asin_from_link(self) -> str:
         """
@@ -91,5 +192,6 @@ class MainApp:
 if __name__ == "__main__":
     model_path = os.path.abspath("models/finetuned_class_model")
     main_app = MainApp(model_checkpoint_path=model_path)
+    main_app.start_warm_up()
     asin_code = main_app.get_asin_from_link()
     main_app.run(asin_code)
@@ -0,0 +1,104 @@
+import os
+import time
+from contextlib import contextmanager
+from profiling import record_span
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+)
+
+# Aşama süreleri milisaniyelerden (tokenizasyon) dakikalara (Ollama) kadar uzandığı için geniş aralık
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_LATENCY = Histogram(
+    "reviewlab_stage_duration_seconds",
+    "Analiz hattındaki aşamaların süresi.",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+REVIEWS_PROCESSED = Counter(
+    "reviewlab_reviews_processed_total",
+    "Sınıflandırılan yorum sayısı."
+)
+PAGES_FETCHED = Counter(
+    "reviewlab_rapidapi_pages_fetched_total",
+    "RapidAPI'den başarıyla alınan yorum sayfası sayısı."
+)
+PAGES_FAILED = Counter(
+    "reviewlab_rapidapi_pages_failed_total",
+    "RapidAPI'den alınamayan yorum sayfası sayısı."
+)
+COALESCED_REQUESTS = Counter(
+    "reviewlab_coalesced_requests_total",
+    "Aynı ASIN için devam eden bir analize katılarak yanıtlanan istek sayısı."
+)
+RAPIDAPI_RETRIES = Counter(
+    "reviewlab_rapidapi_retries_total",
+    "RapidAPI isteklerinin yeniden denenme sayısı (neden: durum kodu ya da bağlantı hatası).",
+    ["reason"]
+)
+RATE_LIMIT_WAIT = Counter(
+    "reviewlab_rapidapi_rate_limit_wait_seconds_total",
+    "RapidAPI hız sınırlayıcısında beklenen toplam süre."
+)
+CIRCUIT_STATE = Gauge(
+    "reviewlab_rapidapi_circuit_state",
+    "RapidAPI devre kesicisinin durumu (0: kapalı, 1: yarı açık, 2: açık).",
+    multiprocess_mode="max"
+)
+CACHE_REQUESTS = Counter(
+    "reviewlab_cache_requests_total",
+    "Önbellek sorguları (review_store, classifier, summary).",
+    ["cache", "result"]
+)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Bloğun süresini verilen aşama adıyla STAGE_LATENCY histogramına ve (varsa) isteğin profiline kaydeder.
+    Hata olsa da süre kaydedilir.
+
+    Args:
+        stage (str): Aşama adı (ör. "rapidapi_page", "forward").
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_LATENCY.labels(stage=stage).observe(duration)
+        # Profil istenen isteklerde aşama zaman çizelgesine de eklenir
+        record_span(stage, start, duration)
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0) -> None:
+    """
+    Önbellek isabet ve ıskalamalarını sayar.
+
+    Args:
+        cache (str): Önbellek adı.
+        hits (int): İsabet sayısı.
+        misses (int): Iskalama sayısı.
+    """
+    if hits:
+        CACHE_REQUESTS.labels(cache=cache, result="hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache=cache, result="miss").inc(misses)
+
+
+def render_metrics() -> tuple:
+    """
+    Metrikleri Prometheus metin biçiminde üretir.
+
+    uvicorn --workers ile çalışırken PROMETHEUS_MULTIPROC_DIR ortam değişkeni tanımlanmalıdır; bu durumda
+    tüm worker'ların metrikleri birleştirilerek döner.
+
+    Returns:
+        tuple: (metrik metni, içerik türü).
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,121 @@
+import os
+import json
+import mmap
+import warnings
+
+# safetensors başlığındaki veri tiplerinin torch karşılıkları
+SAFETENSORS_DTYPES = {
+    "F64": "float64",
+    "F32": "float32",
+    "F16": "float16",
+    "BF16": "bfloat16",
+    "I64": "int64",
+    "I32": "int32",
+    "I16": "int16",
+    "I8": "int8",
+    "U8": "uint8",
+    "BOOL": "bool"
+}
+
+
+def load_mmap_state_dict(safetensors_path: str) -> dict:
+    """
+    safetensors dosyasını salt okunur olarak belleğe eşler ve ağırlıkları kopyalamadan tensörlere dönüştürür.
+
+    Tensörler dosyanın sayfa önbelleğindeki (page cache) verisini doğrudan kullanır; aynı dosyayı eşleyen
+    tüm worker süreçleri ağırlıkların tek bir kopyasını paylaşır.
+
+    Args:
+        safetensors_path (str): model.safetensors dosyasının yolu.
+
+    Returns:
+        dict: Parametre adlarından salt okunur tensörlere eşleme.
+    """
+    import torch
+
+    with open(safetensors_path, "rb") as f:
+        header_size = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_size))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    data_start = 8 + header_size
+    state_dict = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = getattr(torch, SAFETENSORS_DTYPES[info["dtype"]])
+        begin, end = info["data_offsets"]
+        with warnings.catch_warnings():
+            # Eşleme salt okunurdur; çıkarım sırasında ağırlıklara yazılmadığı için uyarı beklenen bir durumdur
+            warnings.simplefilter("ignore", UserWarning)
+            tensor = torch.frombuffer(mapped, dtype=dtype, count=(end - begin) // dtype.itemsize,
+                                      offset=data_start + begin) if end > begin else torch.empty(0, dtype=dtype)
+        state_dict[name] = tensor.reshape(info["shape"])
+    return state_dict
+
+
+def load_mmap_model(model_checkpoint_path: str):
+    """
+    Sınıflandırma modelini yapılandırmasından oluşturur ve ağırlıklarını belleğe eşlenmiş safetensors
+    dosyasından atar (kopyalamadan).
+
+    Args:
+        model_checkpoint_path (str): Modelin kontrol noktası yolu.
+
+    Returns:
+        AutoModelForSequenceClassification: Değerlendirme moduna alınmış model.
+    """
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+    from transformers.modeling_utils import no_init_weights
+
+    safetensors_path = os.path.join(model_checkpoint_path, "model.safetensors")
+    if not os.path.exists(safetensors_path):
+        raise FileNotFoundError(f"{safetensors_path} bulunamadı. mmap yükleme modu safetensors ağırlıkları gerektirir.")
+
+    config = AutoConfig.from_pretrained(model_checkpoint_path)
+    # Rastgele başlatma atlanır; ayrılan fakat hiç yazılmayan bellek sürece özel RSS'e eklenmez
+    with no_init_weights():
+        model = AutoModelForSequenceClassification.from_config(config)
+    model.load_state_dict(load_mmap_state_dict(safetensors_path), strict=True, assign=True)
+    model.eval()
+    return model
+
+
+def get_memory_usage() -> dict:
+    """
+    Sürecin bellek kullanımını /proc/self/status üzerinden okur.
+
+    RssFile, belleğe eşlenmiş dosyalardan (paylaşılan model ağırlıkları) gelen kısımdır; RssAnon ise
+    sürece özel bellektir. Worker sayısı planlanırken asıl belirleyici RssAnon değeridir.
+
+    Returns:
+        dict: rss_mb, rss_anon_mb ve rss_file_mb değerleri. /proc bulunmayan sistemlerde boş sözlük.
+    """
+    fields = {"VmRSS": "rss_mb", "RssAnon": "rss_anon_mb", "RssFile": "rss_file_mb"}
+    usage = {}
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in fields:
+                    usage[fields[key]] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        pass
+    return usage
+
+
+def report_memory_usage(label: str = "Worker") -> dict:
+    """
+    Sürecin bellek kullanımını PID ile birlikte yazdırır.
+
+    Args:
+        label (str): Çıktının başına eklenecek etiket.
+
+    Returns:
+        dict: get_memory_usage() sonucu.
+    """
+    usage = get_memory_usage()
+    if usage:
+        print(f"{label} (pid {os.getpid()}) bellek kullanımı: RSS {usage.get('rss_mb')} MB "
+              f"(özel: {usage.get('rss_anon_mb')} MB, paylaşılan dosya: {usage.get('rss_file_mb')} MB)")
+    return usage
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Profil yalnızca profil istenen isteğin bağlamında tanımlıdır; diğer isteklerde maliyet tek bir okuma işlemidir
+_current_profile = contextvars.ContextVar("current_profile", default=None)
+
+# cProfile aynı anda tek bir profil için çalıştırılır; diğer profil istekleri yalnızca zaman çizelgesi alır
+_cprofile_lock = threading.Lock()
+
+
+def current_profile():
+    """
+    Bu bağlamda etkin olan RequestProfile nesnesini döner, yoksa None döner.
+    """
+    return _current_profile.get()
+
+
+def record_span(name: str, start: float, duration: float) -> None:
+    """
+    Etkin bir profil varsa aşamayı zaman çizelgesine ekler.
+
+    Args:
+        name (str): Aşama adı.
+        start (float): time.perf_counter() cinsinden başlangıç zamanı.
+        duration (float): Süre (saniye).
+    """
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.add_span(name, start, duration)
+
+
+class RequestProfile:
+    """
+    RequestProfile, tek bir isteğin aşama zaman çizelgesini ve cProfile çıktısını toplayan bir sınıftır.
+
+    with bloğu içinde metrics.stage_timer ile ölçülen her aşama zaman çizelgesine eklenir.
+
+    Attributes:
+        profile_id (str): Profil kimliği.
+        spans (list): Aşama adı, başlangıç (ms), süre (ms) ve iş parçacığı bilgileri.
+        top_n (int): Raporda gösterilecek en pahalı fonksiyon sayısı.
+
+    Methods:
+        span(name): Bir bloğu zaman çizelgesine ekleyen bağlam yöneticisi.
+        report(): Zaman çizelgesini ve en pahalı fonksiyonları döner.
+        save(directory): Profili .prof ve .json dosyaları olarak kaydeder.
+    """
+
+    def __init__(self, top_n: int = 30) -> None:
+        self.profile_id = uuid.uuid4().hex
+        self.top_n = top_n
+        self.spans = []
+        self.total_seconds = None
+        self._profiler = None
+        self._lock = threading.Lock()
+        self._start = None
+        self._token = None
+
+    def __enter__(self) -> "RequestProfile":
+        self._start = time.perf_counter()
+        self._token = _current_profile.set(self)
+        if _cprofile_lock.acquire(blocking=False):
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+            _cprofile_lock.release()
+        self.total_seconds = time.perf_counter() - self._start
+        _current_profile.reset(self._token)
+
+    def add_span(self, name: str, start: float, duration: float) -> None:
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "start_ms": round((start - self._start) * 1000, 3),
+                "duration_ms": round(duration * 1000, 3),
+                "thread": threading.current_thread().name
+            })
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Bloğu verilen adla zaman çizelgesine ekler.
+
+        Args:
+            name (str): Aşama adı.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter() - start)
+
+    def _top_functions(self) -> list:
+        if self._profiler is None:
+            return []
+        stats = pstats.Stats(self._profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+        functions = []
+        for (file_name, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            functions.append({
+                "function": f"{os.path.basename(file_name)}:{line}({function})",
+                "ncalls": ncalls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3)
+            })
+        functions.sort(key=lambda item: item["cumtime_ms"], reverse=True)
+        return functions[:self.top_n]
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: Toplam süre, başlangıç zamanına göre sıralı aşamalar ve birikimli süreye göre en pahalı fonksiyonlar.
+                Başka bir profil cProfile'ı kullanıyorsa functions boş döner.
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start_ms"])
+        return {
+            "profile_id": self.profile_id,
+            "total_ms": round(self.total_seconds * 1000, 3) if self.total_seconds is not None else None,
+            "spans": spans,
+            "functions": self._top_functions()
+        }
+
+    def save(self, directory: str) -> str:
+        """
+        Zaman çizelgesini <profile_id>.json, cProfile çıktısını <profile_id>.prof (snakeviz, pstats) olarak kaydeder.
+
+        Args:
+            directory (str): Kayıt klasörü.
+
+        Returns:
+            str: JSON dosyasının yolu.
+        """
+        os.makedirs(directory, exist_ok=True)
+        if self._profiler is not None:
+            self._profiler.dump_stats(os.path.join(directory, f"{self.profile_id}.prof"))
+        report_path = os.path.join(directory, f"{self.profile_id}.json")
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return report_path
+
@@ -0,0 +1,308 @@
+import os
+import time
+import random
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from metrics import CIRCUIT_STATE, RAPIDAPI_RETRIES, RATE_LIMIT_WAIT
+
+# Tekrar denenecek durum kodları: kota aşımı ve geçici sunucu hataları
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Devre kesici açıkken istek gönderilmeden verilen hata. requests.RequestException'dan türediği için
+    mevcut hata yakalama blokları tarafından başarısız bir istek gibi ele alınır.
+    """
+
+
+class QuotaExhaustedError(requests.RequestException):
+    """
+    RapidAPI kotası bittiğinde ve sıfırlanma beklenemeyecek kadar uzaksa istek gönderilmeden verilen hata.
+    """
+
+
+class TokenBucket:
+    """
+    TokenBucket, saniyedeki istek sayısını sınırlayan ve hızını sunucunun geri bildirimine göre ayarlayan
+    bir jeton kovasıdır.
+
+    429 alındığında hız yarıya iner (çarpımsal azaltma; aynı anda gelen 429'lar için saniyede en fazla bir kez),
+    başarılı isteklerde tekrar max_rate'e doğru artar (toplamsal artırma). Böylece hız, kotanın izin verdiği en yüksek değerin hemen altında tutulur.
+    Kota başlıkları kalan istek hakkının bittiğini bildirirse kova sıfırlanma süresi boyunca durdurulur;
+    sıfırlanma max_pause'dan uzaksa kota bitmiş sayılır.
+
+    Attributes:
+        max_rate (float): İzin verilen en yüksek hız (istek/saniye).
+        rate (float): Güncel hız (istek/saniye).
+        capacity (float): Kovanın alabileceği en fazla jeton (anlık patlama büyüklüğü).
+        max_pause (float): Kota sıfırlanması için beklenebilecek en uzun süre (saniye).
+
+    Methods:
+        acquire(): Bir istek için jeton alır; gerekirse bekler ve beklenen süreyi döner.
+        pause(seconds): Verilen süre boyunca jeton verilmesini durdurur.
+        on_throttled(retry_after): 429 sonrası hızı düşürür ve kovayı durdurur.
+        on_success(): Başarılı istek sonrası hızı kademeli olarak artırır.
+        update_from_headers(headers): RapidAPI kota başlıklarına göre kovayı günceller.
+        quota_exhausted(): Kotanın bitip bitmediğini döner.
+    """
+
+    def __init__(self, max_rate: float, capacity: float = None, min_rate: float = 0.5, max_pause: float = 30.0) -> None:
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max_rate
+        self.capacity = capacity or max(1.0, max_rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self.max_pause = max_pause
+        self._paused_until = 0.0
+        self._exhausted_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Bir jeton ayırır. Jeton yoksa ayrılan jetonun üretileceği ana kadar bekler.
+
+        Returns:
+            float: Beklenen süre (saniye).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Jeton borç olarak ayrılır; eşzamanlı çağıranlar sırayla ileriye dağıtılır
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate, self._paused_until - now)
+        if wait > 0:
+            RATE_LIMIT_WAIT.inc(wait)
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def on_throttled(self, retry_after: float = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Aynı aşımın eşzamanlı 429'ları hızı tekrar tekrar yarıya indirmesin
+            if now - self._last_decrease >= 1.0:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._last_decrease = now
+            self._tokens = min(self._tokens, 0.0)
+        if retry_after:
+            self.pause(retry_after)
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def update_from_headers(self, headers) -> None:
+        """
+        x-ratelimit-requests-remaining ve x-ratelimit-requests-reset başlıklarını okur. Kalan hak bittiyse
+        kova sıfırlanma süresi kadar durdurulur (süre max_pause'dan uzunsa kota bitmiş sayılır); kalan hak azsa
+        anlık patlama kalan hakla sınırlanır.
+
+        Args:
+            headers: Yanıt başlıkları.
+        """
+        remaining = _header_number(headers, "x-ratelimit-requests-remaining")
+        if remaining is None:
+            return
+        if remaining <= 0:
+            reset = _header_number(headers, "x-ratelimit-requests-reset")
+            reset = reset if reset is not None else 1.0
+            if reset <= self.max_pause:
+                self.pause(reset)
+            else:
+                with self._lock:
+                    self._exhausted_until = time.monotonic() + reset
+                print(f"RapidAPI kotası doldu; {reset:.0f} saniye sonra sıfırlanacak.")
+            return
+        with self._lock:
+            self._tokens = min(self._tokens, remaining)
+
+    def quota_exhausted(self) -> bool:
+        return time.monotonic() < self._exhausted_until
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker, art arda başarısız olan istekler sonrası API'ye istek göndermeyi bir süre durduran
+    bir devre kesicidir.
+
+    Kapalı durumda istekler geçer; failure_threshold kadar art arda hata olursa devre açılır ve
+    reset_timeout boyunca istekler hemen reddedilir. Süre dolunca tek bir deneme isteğine izin verilir
+    (yarı açık); deneme başarılıysa devre kapanır, başarısızsa yeniden açılır.
+
+    Attributes:
+        failure_threshold (int): Devreyi açan art arda hata sayısı.
+        reset_timeout (float): Devrenin açık kalacağı süre (saniye).
+        state (str): "closed", "open" ya da "half_open".
+
+    Methods:
+        allow(): İsteğin gönderilip gönderilemeyeceğini döner.
+        record_success(): Başarılı isteği kaydeder.
+        record_failure(): Başarısız isteği kaydeder.
+    """
+
+    STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            print(f"RapidAPI devre kesici durumu: {self.state} -> {state}")
+        self.state = state
+        CIRCUIT_STATE.set(self.STATES[state])
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._set_state("half_open")
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self._set_state("closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state("open")
+
+
+class RateLimitedSession(requests.Session):
+    """
+    RateLimitedSession, her isteği jeton kovası, zaman aşımı, yeniden deneme ve devre kesiciden geçiren
+    bir requests.Session'dır.
+
+    429 ve 5xx yanıtlarında ve bağlantı hatalarında istek, Retry-After başlığına (yoksa jitter'lı üstel
+    geri çekilmeye) göre beklenerek yeniden denenir. Denemeler tükenirse son yanıt döner ya da hata
+    fırlatılır; çağıran kod bunları önceden olduğu gibi başarısız sayfa olarak ele alır.
+
+    Attributes:
+        bucket (TokenBucket): Hız sınırlayıcı.
+        breaker (CircuitBreaker): Devre kesici.
+        timeout (tuple): (bağlantı, okuma) zaman aşımı (saniye).
+        max_retries (int): Bir istek için en fazla yeniden deneme sayısı.
+        backoff_base (float): Üstel geri çekilmenin başlangıç süresi (saniye).
+        backoff_max (float): Tek bir beklemenin ve kota sıfırlanması için beklemenin üst sınırı (saniye).
+    """
+
+    def __init__(self, max_rate: float = None, burst: float = None, timeout: float = None, max_retries: int = None,
+                 backoff_base: float = None, backoff_max: float = None, failure_threshold: int = None,
+                 reset_timeout: float = None) -> None:
+        """
+        Verilmeyen değerler ortam değişkenlerinden okunur: RAPIDAPI_MAX_RPS (10), RAPIDAPI_BURST (max_rate),
+        RAPIDAPI_TIMEOUT (10), RAPIDAPI_MAX_RETRIES (4), RAPIDAPI_BACKOFF_BASE (0.5), RAPIDAPI_BACKOFF_MAX (30),
+        RAPIDAPI_CIRCUIT_THRESHOLD (5) ve RAPIDAPI_CIRCUIT_RESET (30).
+        """
+        super().__init__()
+        max_rate = max_rate or float(os.getenv("RAPIDAPI_MAX_RPS", "10"))
+        burst = burst or float(os.getenv("RAPIDAPI_BURST", str(max_rate)))
+        read_timeout = timeout or float(os.getenv("RAPIDAPI_TIMEOUT", "10"))
+        self.backoff_base = backoff_base or float(os.getenv("RAPIDAPI_BACKOFF_BASE", "0.5"))
+        self.backoff_max = backoff_max or float(os.getenv("RAPIDAPI_BACKOFF_MAX", "30"))
+        self.bucket = TokenBucket(max_rate, capacity=burst, max_pause=self.backoff_max)
+        self.breaker = CircuitBreaker(
+            failure_threshold or int(os.getenv("RAPIDAPI_CIRCUIT_THRESHOLD", "5")),
+            reset_timeout or float(os.getenv("RAPIDAPI_CIRCUIT_RESET", "30"))
+        )
+        self.timeout = (min(3.05, read_timeout), read_timeout)
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("RAPIDAPI_MAX_RETRIES", "4"))
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Jitter'lı üstel geri çekilme süresi (full jitter): 0 ile base * 2^attempt arasında rastgele bir değer.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            if self.bucket.quota_exhausted():
+                raise QuotaExhaustedError("RapidAPI kotası doldu; istek gönderilmedi.")
+            if not self.breaker.allow():
+                raise CircuitOpenError("RapidAPI devre kesicisi açık; istek gönderilmedi.")
+            self.bucket.acquire()
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                reason, wait = type(e).__name__, self.backoff(attempt)
+            else:
+                self.bucket.update_from_headers(response.headers)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    # 4xx (ör. geçersiz anahtar) servis sağlığıyla ilgili değildir, devreyi açmaz
+                    self.breaker.record_success()
+                    self.bucket.on_success()
+                    return response
+                retry_after = _retry_after(response.headers)
+                if response.status_code == 429:
+                    # Kota aşımı sunucunun sağlıklı olduğunu gösterir; devre yerine hız düşürülür
+                    self.breaker.record_success()
+                    self.bucket.on_throttled(retry_after)
+                else:
+                    self.breaker.record_failure()
+                if attempt >= self.max_retries or self.bucket.quota_exhausted():
+                    return response
+                reason = str(response.status_code)
+                wait = min(self.backoff_max, retry_after) if retry_after is not None else self.backoff(attempt)
+                response.close()
+
+            RAPIDAPI_RETRIES.labels(reason=reason).inc()
+            attempt += 1
+            time.sleep(wait)
+
+
+def _header_number(headers, name: str) -> float:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _retry_after(headers) -> float:
+    """
+    Retry-After başlığını saniye olarak döner; başlık HTTP tarihi olarak da verilebilir.
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
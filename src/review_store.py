@@ -0,0 +1,376 @@
+import os
+import json
+import time
+import sqlite3
+
+
+class ReviewStore:
+    """
+    ReviewStore, ASIN bazında çekilen yorumları yerel bir SQLite veritabanında saklayan bir sınıftır.
+
+    Attributes:
+        db_path (str): SQLite veritabanı dosyasının yolu.
+        ttl_seconds (int): Saklanan yorumların taze kabul edileceği süre (saniye).
+
+    Methods:
+        is_fresh(asin): Ürünün yorumlarının TTL süresi içinde olup olmadığını döner.
+        has_product(asin): Ürün için saklanmış yorum olup olmadığını döner.
+        get_reviews(asin): Saklanan yorum kayıtlarını sırasıyla döner.
+        get_review_ids(asin): Saklanan yorumların kimliklerini döner.
+        save_reviews(asin, records, total_reviews): Ürünün tüm yorumlarını yeniden yazar.
+        add_new_reviews(asin, records, total_reviews): Yeni yorumları mevcut kayıtların önüne ekler.
+        get_classified_ids(asin, model_fingerprint): Aynı modelle sınıflandırılmış yorumların kimliklerini döner.
+        save_classifications(asin, model_fingerprint, items): Sınıflandırma sonuçlarını ekler ve kategori sayılarını günceller.
+        get_analysis(asin): Ürünün kategori sayılarını ve son özetini döner.
+        get_categorized_reviews(asin): Sınıflandırılmış yorumları kategori bazında gruplanmış olarak döner.
+        save_summary(asin, summary, category_counts): Özeti ve özetlendiği andaki kategori sayılarını saklar.
+    """
+
+    def __init__(self, db_path: str = None, ttl_seconds: int = None) -> None:
+        """
+        Args:
+            db_path (str): Veritabanı dosyasının yolu. Verilmezse REVIEW_CACHE_PATH ortam değişkeni,
+                o da yoksa src/cache/reviews.sqlite3 kullanılır.
+            ttl_seconds (int): Önbellek süresi. Verilmezse REVIEW_CACHE_TTL ortam değişkeni,
+                o da yoksa 86400 (1 gün) kullanılır.
+        """
+        default_path = os.path.join(os.path.dirname(__file__), 'cache', 'reviews.sqlite3')
+        self.db_path = db_path or os.getenv("REVIEW_CACHE_PATH", default_path)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("REVIEW_CACHE_TTL", "86400"))
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS products (
+                    asin TEXT PRIMARY KEY,
+                    total_reviews INTEGER,
+                    fetched_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS reviews (
+                    asin TEXT NOT NULL,
+                    review_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    rating REAL,
+                    review_date TEXT,
+                    review_comment TEXT,
+                    PRIMARY KEY (asin, review_id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS classifications (
+                    asin TEXT NOT NULL,
+                    review_id TEXT NOT NULL,
+                    model_fingerprint TEXT NOT NULL,
+                    categories TEXT NOT NULL,
+                    PRIMARY KEY (asin, review_id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    asin TEXT PRIMARY KEY,
+                    model_fingerprint TEXT,
+                    category_counts TEXT,
+                    classified_count INTEGER,
+                    summary TEXT,
+                    summary_counts TEXT,
+                    updated_at REAL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Her işlem için ayrı bir bağlantı açar; böylece sınıf farklı iş parçacıklarından güvenle kullanılabilir.
+        """
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def is_fresh(self, asin: str) -> bool:
+        """
+        Ürünün yorumları TTL süresi içinde çekildiyse True döner.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+
+        Returns:
+            bool: Kayıtların taze olup olmadığı.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT fetched_at FROM products WHERE asin = ?", (asin,)).fetchone()
+        return row is not None and (time.time() - row[0]) < self.ttl_seconds
+
+    def has_product(self, asin: str) -> bool:
+        """
+        Ürün için daha önce saklanmış yorum olup olmadığını döner.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+
+        Returns:
+            bool: Ürünün kayıtlı olup olmadığı.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT 1 FROM products WHERE asin = ?", (asin,)).fetchone()
+        return row is not None
+
+    def get_total_reviews(self, asin: str) -> int:
+        """
+        Son çekimde API'nin bildirdiği toplam yorum sayısını döner.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+
+        Returns:
+            int: Toplam yorum sayısı. Kayıt yoksa 0.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT total_reviews FROM products WHERE asin = ?", (asin,)).fetchone()
+        return row[0] if row else 0
+
+    def get_reviews(self, asin: str) -> list:
+        """
+        Ürüne ait saklanan yorum kayıtlarını sırasıyla döner.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+
+        Returns:
+            list: review_id, rating, review_date ve review_comment alanlarını içeren sözlüklerin listesi.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT review_id, rating, review_date, review_comment FROM reviews WHERE asin = ? ORDER BY position",
+                (asin,)
+            ).fetchall()
+        return [
+            {"review_id": row[0], "rating": row[1], "review_date": row[2], "review_comment": row[3]}
+            for row in rows
+        ]
+
+    def get_review_ids(self, asin: str) -> set:
+        """
+        Ürüne ait saklanan yorumların kimliklerini döner.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+
+        Returns:
+            set: Yorum kimlikleri.
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT review_id FROM reviews WHERE asin = ?", (asin,)).fetchall()
+        return {row[0] for row in rows}
+
+    def save_reviews(self, asin: str, records: list, total_reviews: int) -> None:
+        """
+        Ürünün tüm yorumlarını verilen kayıtlarla değiştirir.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            records (list): Sırasıyla saklanacak yorum kayıtları.
+            total_reviews (int): API'nin bildirdiği toplam yorum sayısı.
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM reviews WHERE asin = ?", (asin,))
+            self._insert_reviews(conn, asin, records, start_position=0)
+            self._touch(conn, asin, total_reviews)
+            # Artık listelenmeyen yorumların sınıflandırmaları kategori sayılarından düşülür
+            removed = conn.execute(
+                """
+                DELETE FROM classifications
+                WHERE asin = ? AND review_id NOT IN (SELECT review_id FROM reviews WHERE asin = ?)
+                """,
+                (asin, asin)
+            ).rowcount
+            if removed:
+                self._recount(conn, asin)
+
+    def add_new_reviews(self, asin: str, records: list, total_reviews: int) -> None:
+        """
+        Yeni yorumları mevcut kayıtların önüne ekler ve ürünün çekim zamanını günceller.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            records (list): En yeniden eskiye sıralı yeni yorum kayıtları.
+            total_reviews (int): API'nin bildirdiği toplam yorum sayısı.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT MIN(position) FROM reviews WHERE asin = ?", (asin,)).fetchone()
+            first_position = row[0] if row and row[0] is not None else 0
+            self._insert_reviews(conn, asin, records, start_position=first_position - len(records))
+            self._touch(conn, asin, total_reviews)
+
+    def _insert_reviews(self, conn: sqlite3.Connection, asin: str, records: list, start_position: int) -> None:
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO reviews (asin, review_id, position, rating, review_date, review_comment)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (asin, record["review_id"], start_position + i, record.get("rating"),
+                 record.get("review_date"), record.get("review_comment"))
+                for i, record in enumerate(records)
+            ]
+        )
+
+    def _touch(self, conn: sqlite3.Connection, asin: str, total_reviews: int) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO products (asin, total_reviews, fetched_at) VALUES (?, ?, ?)",
+            (asin, total_reviews, time.time())
+        )
+
+    def get_classified_ids(self, asin: str, model_fingerprint: str) -> set:
+        """
+        Ürünün verilen modelle sınıflandırılmış yorumlarının kimliklerini döner. Model değiştiyse boş küme döner,
+        böylece tüm yorumlar yeni modelle yeniden sınıflandırılır.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            model_fingerprint (str): Sınıflandırıcının model parmak izi.
+
+        Returns:
+            set: Yorum kimlikleri.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT review_id FROM classifications WHERE asin = ? AND model_fingerprint = ?",
+                (asin, model_fingerprint)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def save_classifications(self, asin: str, model_fingerprint: str, items: list) -> dict:
+        """
+        Yeni sınıflandırma sonuçlarını saklar ve ürünün kategori sayılarına ekler. Saklanan sonuçlar farklı
+        bir modele aitse önce silinir ve sayılar sıfırdan başlar.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            model_fingerprint (str): Sınıflandırıcının model parmak izi.
+            items (list): (review_id, kategoriler listesi) çiftleri.
+
+        Returns:
+            dict: Güncellenmiş analiz kaydı (get_analysis çıktısı).
+        """
+        with self._connect() as conn:
+            analysis = self._read_analysis(conn, asin)
+            if analysis is None or analysis["model_fingerprint"] != model_fingerprint:
+                conn.execute("DELETE FROM classifications WHERE asin = ?", (asin,))
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO analyses (asin, model_fingerprint, category_counts, classified_count)
+                    VALUES (?, ?, '{}', 0)
+                    """,
+                    (asin, model_fingerprint)
+                )
+                analysis = self._read_analysis(conn, asin)
+
+            # Yalnızca gerçekten eklenen yorumlar mevcut sayılara eklenir
+            category_counts = analysis["category_counts"]
+            inserted = 0
+            for review_id, categories in items:
+                cursor = conn.execute(
+                    """
+                    INSERT OR IGNORE INTO classifications (asin, review_id, model_fingerprint, categories)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (asin, review_id, model_fingerprint, json.dumps(categories, ensure_ascii=False))
+                )
+                if cursor.rowcount:
+                    inserted += 1
+                    for kategori in categories:
+                        category_counts[kategori] = category_counts.get(kategori, 0) + 1
+
+            conn.execute(
+                "UPDATE analyses SET category_counts = ?, classified_count = ?, updated_at = ? WHERE asin = ?",
+                (json.dumps(category_counts, ensure_ascii=False), analysis["classified_count"] + inserted,
+                 time.time(), asin)
+            )
+            return self._read_analysis(conn, asin)
+
+    def get_analysis(self, asin: str) -> dict:
+        """
+        Ürünün saklanan analiz kaydını döner.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+
+        Returns:
+            dict: model_fingerprint, category_counts, classified_count, summary, summary_counts ve updated_at
+                alanları. Kayıt yoksa None.
+        """
+        with self._connect() as conn:
+            return self._read_analysis(conn, asin)
+
+    def get_categorized_reviews(self, asin: str) -> dict:
+        """
+        Sınıflandırılmış yorumları, yorumların saklanma sırasıyla kategori bazında gruplar.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+
+        Returns:
+            dict: Kategorilere göre gruplandırılmış yorum metinleri.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT r.review_comment, c.categories
+                FROM classifications c JOIN reviews r ON r.asin = c.asin AND r.review_id = c.review_id
+                WHERE c.asin = ?
+                ORDER BY r.position
+                """,
+                (asin,)
+            ).fetchall()
+        kategori_yorumlari = {}
+        for comment, categories in rows:
+            for kategori in json.loads(categories):
+                kategori_yorumlari.setdefault(kategori, []).append(comment)
+        return kategori_yorumlari
+
+    def save_summary(self, asin: str, summary: str, category_counts: dict) -> None:
+        """
+        Özeti ve özetin üretildiği andaki kategori sayılarını saklar.
+
+        Args:
+            asin (str): Ürüne ait ASIN kodu.
+            summary (str): Özet metni.
+            category_counts (dict): Özetlenen kategori sayıları.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE analyses SET summary = ?, summary_counts = ?, updated_at = ? WHERE asin = ?",
+                (summary, json.dumps(category_counts, ensure_ascii=False), time.time(), asin)
+            )
+
+    def _recount(self, conn: sqlite3.Connection, asin: str) -> None:
+        """
+        Ürünün kategori sayılarını saklanan sınıflandırmalardan yeniden hesaplar.
+        """
+        category_counts = {}
+        rows = conn.execute("SELECT categories FROM classifications WHERE asin = ?", (asin,)).fetchall()
+        for (categories,) in rows:
+            for kategori in json.loads(categories):
+                category_counts[kategori] = category_counts.get(kategori, 0) + 1
+        conn.execute(
+            "UPDATE analyses SET category_counts = ?, classified_count = ?, updated_at = ? WHERE asin = ?",
+            (json.dumps(category_counts, ensure_ascii=False), len(rows), time.time(), asin)
+        )
+
+    def _read_analysis(self, conn: sqlite3.Connection, asin: str) -> dict:
+        row = conn.execute(
+            """
+            SELECT model_fingerprint, category_counts, classified_count, summary, summary_counts, updated_at
+            FROM analyses WHERE asin = ?
+            """,
+            (asin,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "model_fingerprint": row[0],
+            "category_counts": json.loads(row[1]) if row[1] else {},
+            "classified_count": row[2] or 0,
+            "summary": row[3],
+            "summary_counts": json.loads(row[4]) if row[4] else None,
+            "updated_at": row[5]
+        }
@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    SingleFlight, aynı anahtar için eşzamanlı gelen çağrıları tek bir çalıştırmada birleştiren bir yardımcıdır.
+
+    Bir anahtar için çalışan bir çağrı varken gelen diğer çağrılar yeni bir çalıştırma başlatmaz; çalışan
+    çağrının bitmesini bekler ve aynı sonucu (ya da aynı hatayı) alır. Çalıştırma bittiğinde anahtar
+    serbest kalır, sonraki çağrılar yeniden çalıştırır; yani bu bir önbellek değildir.
+
+    Methods:
+        do(key, fn, *args): fn'i anahtar başına aynı anda en fazla bir kez çalıştırır.
+        in_flight(key): Anahtar için çalışan bir çağrı olup olmadığını döner.
+    """
+
+    def __init__(self) -> None:
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args) -> tuple:
+        """
+        Args:
+            key: Birleştirme anahtarı (ör. ASIN).
+            fn (callable): Çalıştırılacak fonksiyon.
+            *args: Fonksiyona verilecek argümanlar.
+
+        Returns:
+            tuple: (sonuç, başka bir çağrının sonucunun paylaşılıp paylaşılmadığı).
+
+        Raises:
+            Exception: fn'in fırlattığı hata, bekleyen tüm çağıranlara iletilir.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            shared = future is not None
+            if not shared:
+                future = Future()
+                self._calls[key] = future
+
+        if shared:
+            return future.result(), True
+
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result(), False
+
+    def in_flight(self, key) -> bool:
+        with self._lock:
+            return key in self._calls
@@ -1,44 +1,211 @@
+import os
+import json
+import atexit
+import hashlib
+import threading
 import requests
-import ollama
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from lru_cache import LRUCache
+from metrics import record_cache, stage_timer
+
+# İstem şablonları değiştiğinde artırılmalıdır; eski önbellek kayıtları böylece kullanılmaz.
+PROMPT_VERSION = "1"
+
+
+class OllamaClient:
+    """
+    OllamaClient, Ollama HTTP API'sine bağlantı havuzu üzerinden istek gönderen, yeniden kullanılabilir bir istemcidir.
+
+    Tüm istekler aynı keep-alive oturumunu kullanır ve keep_alive parametresiyle modelin istekler
+    arasında bellekte kalması sağlanır. Aynı anda Ollama'ya gönderilecek istek sayısı sınırlıdır.
+
+    Attributes:
+        base_url (str): Ollama sunucusunun adresi.
+        model (str): Kullanılan model adı.
+        keep_alive (str): Modelin son istekten sonra bellekte tutulacağı süre (örn. "30m", "-1" süresiz).
+        timeout (tuple): (bağlantı, okuma) zaman aşımı süreleri (saniye).
+        max_concurrency (int): Aynı anda gönderilebilecek en fazla istek sayısı.
+
+    Methods:
+        generate(prompt): Yanıtın tamamını döner.
+        generate_stream(prompt): Yanıtı üretildikçe parça parça döner.
+        preload(): Modeli bir istem göndermeden belleğe yükler.
+    """
+
+    def __init__(self, base_url: str = None, model: str = None, keep_alive: str = None,
+                 timeout: float = None, max_concurrency: int = None) -> None:
+        """
+        Args:
+            base_url (str): Verilmezse OLLAMA_HOST ortam değişkeni, o da yoksa http://localhost:11434 kullanılır.
+            model (str): Verilmezse OLLAMA_MODEL ortam değişkeni, o da yoksa "llama3" kullanılır.
+            keep_alive (str): Verilmezse OLLAMA_KEEP_ALIVE ortam değişkeni, o da yoksa "30m" kullanılır.
+            timeout (float): Okuma zaman aşımı. Verilmezse OLLAMA_TIMEOUT ortam değişkeni, o da yoksa 300 kullanılır.
+            max_concurrency (int): Verilmezse OLLAMA_MAX_CONCURRENCY ortam değişkeni, o da yoksa 4 kullanılır.
+        """
+        self.base_url = (base_url or os.getenv("OLLAMA_HOST", "http://localhost:11434")).rstrip("/")
+        self.model = model or os.getenv("OLLAMA_MODEL", "llama3")
+        self.keep_alive = keep_alive or os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        self.timeout = (5, timeout or float(os.getenv("OLLAMA_TIMEOUT", "300")))
+        self.max_concurrency = max_concurrency or int(os.getenv("OLLAMA_MAX_CONCURRENCY", "4"))
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _payload(self, prompt: str, stream: bool) -> dict:
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self.keep_alive
+        }
+
+    def generate(self, prompt: str) -> str:
+        """
+        İstemi gönderir ve yanıtın tamamını döner.
+
+        Args:
+            prompt (str): Ollama'ya gönderilecek istem.
+
+        Returns:
+            str: Modelin yanıtı.
+        """
+        with self._semaphore, stage_timer("ollama_generate"):
+            response = self.session.post(
+                f"{self.base_url}/api/generate", json=self._payload(prompt, stream=False), timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()["response"].strip()
+
+    def generate_stream(self, prompt: str):
+        """
+        İstemi gönderir ve yanıtı üretildikçe parça parça döner. Eşzamanlılık hakkı akış bitene kadar tutulur.
+
+        Args:
+            prompt (str): Ollama'ya gönderilecek istem.
+
+        Yields:
+            str: Modelin ürettiği bir sonraki metin parçası.
+        """
+        with self._semaphore, stage_timer("ollama_generate"):
+            with self.session.post(f"{self.base_url}/api/generate", json=self._payload(prompt, stream=True),
+                                   stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+
+    def preload(self) -> bool:
+        """
+        Modeli boş bir istekle belleğe yükler; ilk kullanıcının soğuk yükleme süresini beklemesini önler.
+
+        Returns:
+            bool: Yükleme başarılıysa True.
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": self.keep_alive},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return True
+        except requests.RequestException as e:
+            print(f"Ollama modeli önceden yüklenemedi: {str(e)}")
+            return False
 
 
 class ReviewSummarizer:
     """
     ReviewSummarizer, verilen sınıflandırılmış yorumları özetleyen bir sınıftır.
 
+    Attributes:
+        mode (str): Özetleme modu; "single", "map_reduce" veya "auto".
+        chunk_chars (int): Map aşamasında tek bir Ollama çağrısına verilecek en fazla yorum karakteri.
+        max_map_calls (int): Map aşamasında yapılacak en fazla Ollama çağrısı.
+        max_concurrency (int): Map aşamasında aynı anda yapılacak en fazla Ollama çağrısı.
+        client (OllamaClient): Ollama'ya istek göndermek için kullanılan ortak istemci.
+        model_name (str): Özetleme için kullanılan Ollama modeli.
+        summary_cache (LRUCache): Yorum grupları, istem sürümü ve model adına göre saklanan özetler.
+
     Methods:
+        build_prompt(kategori_yorum_metni): Puanlı sonuç formatını isteyen istemi oluşturur.
         summarize_reviews(review_data): Verilen yorumları ve kategorileri özetler.
+        summarize_reviews_cached(review_data): Özeti ve önbellekten gelip gelmediğini döner.
+        get_cached_summary(review_data): Önbellekteki özeti döner.
+        summarize_reviews_stream(review_data): Özeti üretildikçe parça parça döner.
+        save_cache(): Özet önbelleğini diske yazar.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, mode: str = None, chunk_chars: int = None, max_concurrency: int = None,
+                 max_map_calls: int = None, cache_size: int = None, cache_path: str = None,
+                 client: OllamaClient = None) -> None:
+        """
+        Args:
+            mode (str): "single" tüm yorumları tek bir istemde özetler; "map_reduce" her kategoriyi (ve büyük
+                kategorilerin parçalarını) ayrı ve eşzamanlı çağrılarla özetleyip kısa bir birleştirme çağrısı
+                yapar; "auto" yorum metni chunk_chars'ı aşarsa map_reduce kullanır. Verilmezse SUMMARY_MODE
+                ortam değişkeni, o da yoksa "auto" kullanılır.
+            chunk_chars (int): Verilmezse SUMMARY_CHUNK_CHARS ortam değişkeni, o da yoksa 6000 kullanılır.
+            max_concurrency (int): Verilmezse SUMMARY_MAX_CONCURRENCY ortam değişkeni, o da yoksa 4 kullanılır.
+            max_map_calls (int): Verilmezse SUMMARY_MAX_MAP_CALLS ortam değişkeni, o da yoksa 32 kullanılır.
+            cache_size (int): Önbellekteki en fazla özet sayısı; 0 önbelleği kapatır. Verilmezse
+                SUMMARY_CACHE_SIZE ortam değişkeni, o da yoksa 256 kullanılır.
+            cache_path (str): Özetlerin yeniden başlatmalar arasında saklanacağı JSON dosyası. Verilmezse
+                SUMMARY_CACHE_PATH ortam değişkeni kullanılır; o da yoksa önbellek yalnızca bellekte tutulur.
+            client (OllamaClient): Ollama istemcisi. Verilmezse ortam değişkenlerinden yapılandırılan yeni bir istemci oluşturulur.
+        """
         load_dotenv()
+        self.mode = mode or os.getenv("SUMMARY_MODE", "auto")
+        if self.mode not in ("single", "map_reduce", "auto"):
+            raise ValueError(f"Desteklenmeyen özetleme modu: {self.mode}. Geçerli değerler: 'single', 'map_reduce', 'auto'.")
+        self.chunk_chars = chunk_chars or int(os.getenv("SUMMARY_CHUNK_CHARS", "6000"))
+        self.max_concurrency = max_concurrency or int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+        self.max_map_calls = max_map_calls or int(os.getenv("SUMMARY_MAX_MAP_CALLS", "32"))
+        self.client = client or OllamaClient()
+        self.model_name = self.client.model
+
+        cache_size = cache_size if cache_size is not None else int(os.getenv("SUMMARY_CACHE_SIZE", "256"))
+        cache_path = cache_path or os.getenv("SUMMARY_CACHE_PATH")
+        self.summary_cache = LRUCache(cache_size, path=cache_path) if cache_size > 0 else None
+        if self.summary_cache is not None and cache_path:
+            atexit.register(self.save_cache)
 
     def ollama_generate(self, prompt):
-        url = "http://localhost:11434/api/generate"
-        payload = {
-            "model": "llama3",
-            "prompt": prompt,
-            "stream": False
-        }
-        response = requests.post(url, json=payload)
-        return response.json()["response"].strip()
+        return self.client.generate(prompt)
 
-    def summarize_reviews(self, kategori_yorumlari: dict) -> str:
+    def ollama_generate_stream(self, prompt):
         """
-        Verilen yorumları ve kategorileri özetler.
+        Ollama'dan yanıtı üretildikçe parça parça alan bir generator.
 
         Args:
-            kategori_yorumlari (dict): Kategorilere göre gruplandırılmış yorumları içeren sözlük.
+            prompt (str): Ollama'ya gönderilecek istem.
 
-        Returns:
-            str: Tüm yorumların özetlendiği metin.
+        Yields:
+            str: Modelin ürettiği bir sonraki metin parçası.
         """
-        kategori_yorum_metni = "\n".join(
-            [f"{kategori}: " + " | ".join(yorumlar) for kategori, yorumlar in kategori_yorumlari.items()]
-        )
+        yield from self.client.generate_stream(prompt)
 
-        prompt = f"""
+    def build_prompt(self, kategori_yorum_metni: str, baslik: str = "Yorumlar") -> str:
+        """
+        Kategori yorumlarından (ya da kategori özetlerinden) puanlı sonuç formatını isteyen istemi oluşturur.
+
+        Args:
+            kategori_yorum_metni (str): Her satırı "KATEGORI: ..." biçiminde olan metin.
+            baslik (str): Metnin isteme eklenirken kullanılacak başlığı. Varsayılan olarak "Yorumlar".
+
+        Returns:
+            str: Ollama'ya gönderilecek istem.
+        """
+        return f"""
         Sen [Türkçe] AI yorum özetleme asistanısın. Verdiğin yanıt tamamen Türkçe olmalıdır. [Dil: Türkçe]
         Aşağıdaki farklı kategorilere ait kullanıcı yorumlarını analiz et ve her kategori için duygu analizi yaparak ortalama bir puan hesapla. 
         Ardından her kategori için ayrı ayrı değerlendirme hazırla.
@@ -66,13 +233,279 @@ class ReviewSummarizer:
         5. Genel Sonuç: (Tüm kategoriler için genel değerlendirme)
         <format>
 
-        Yorumlar:
+        {baslik}:
         {kategori_yorum_metni}
 
         """
+
+    def _chunk_reviews(self, yorumlar: list) -> list:
+        """
+        Bir kategorinin yorumlarını her biri en fazla chunk_chars karakter olan parçalara böler.
+
+        Args:
+            yorumlar (list): Kategoriye ait yorumlar.
+
+        Returns:
+            list: Yorum listelerinden oluşan parçalar.
+        """
+        chunks = []
+        current = []
+        current_chars = 0
+        for yorum in yorumlar:
+            if current and current_chars + len(yorum) > self.chunk_chars:
+                chunks.append(current)
+                current = []
+                current_chars = 0
+            current.append(yorum)
+            current_chars += len(yorum) + 3  # " | " ayracı
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _summarize_chunk(self, kategori: str, yorumlar: list, ara_ozet: bool = False) -> str:
+        """
+        Map aşaması: tek bir kategori parçasını kısa bir ara özete dönüştürür.
+
+        Args:
+            kategori (str): Kategori adı.
+            yorumlar (list): Parçadaki yorumlar ya da (ara_ozet True ise) ara özetler.
+            ara_ozet (bool): Parça, önceki turda üretilmiş ara özetlerden oluşuyorsa True.
+
+        Returns:
+            str: Ara özet.
+        """
+        if ara_ozet:
+            gorev = f"""Aşağıdakiler "{kategori}" kategorisine ait yorum gruplarının ara özetleridir. Ara özetleri birleştirerek
+        en fazla 5 cümlede öne çıkan olumlu ve olumsuz noktaları özetle.
+        Son satırda ara özetlerdeki puanlara göre ortalama puanı "Puan: x/10" biçiminde belirt.
+
+        Ara özetler:"""
+        else:
+            gorev = f"""Aşağıdaki yorumlar "{kategori}" kategorisine aittir. Yorumlardaki duyguyu analiz et ve
+        en fazla 5 cümlede öne çıkan olumlu ve olumsuz noktaları özetle.
+        Son satırda bu yorumlara göre ortalama puanı "Puan: x/10" biçiminde belirt.
+
+        Yorumlar:"""
+        prompt = f"""
+        Sen [Türkçe] AI yorum özetleme asistanısın. Verdiğin yanıt tamamen Türkçe olmalıdır. [Dil: Türkçe]
+        {gorev}
+        {" | ".join(yorumlar)}
+        """
+        return self.ollama_generate(prompt)
+
+    def _summarize_tasks(self, tasks: list, ara_ozet: bool = False) -> dict:
+        """
+        (kategori, parça) görevlerini eşzamanlı olarak özetler. Tek bir ara özetten oluşan parça yeniden
+        özetlenmeden olduğu gibi kullanılır.
+
+        Args:
+            tasks (list): (kategori, parça) çiftleri.
+            ara_ozet (bool): Parçalar ara özetlerden oluşuyorsa True.
+
+        Returns:
+            dict: Kategori -> ara özet listesi.
+        """
+        def summarize(task):
+            kategori, chunk = task
+            if ara_ozet and len(chunk) == 1:
+                return chunk[0]
+            return self._summarize_chunk(kategori, chunk, ara_ozet=ara_ozet)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            partial_summaries = list(executor.map(summarize, tasks))
+
+        kategori_ozetleri = {}
+        for (kategori, _), partial_summary in zip(tasks, partial_summaries):
+            kategori_ozetleri.setdefault(kategori, []).append(partial_summary)
+        return kategori_ozetleri
+
+    def _map_categories(self, kategori_yorumlari: dict) -> str:
+        """
+        Map aşaması: her kategori parçasını eşzamanlı olarak özetler. Ara özetlerin toplamı tek bir isteme
+        sığmıyorsa her kategorinin ara özetleri chunk_chars'lık parçalar halinde yeniden özetlenir; bu,
+        metin chunk_chars'a sığana ya da daha fazla kısaltılamayana kadar tekrarlanır.
+
+        Map çağrısı sayısı max_map_calls ile sınırlıdır: sınırı aşan kategorilerden eşit aralıklarla seçilen
+        parçalar özetlenir.
+
+        Args:
+            kategori_yorumlari (dict): Kategorilere göre gruplandırılmış yorumları içeren sözlük.
+
+        Returns:
+            str: Her satırı "KATEGORI: ara özet | ..." biçiminde olan metin.
+        """
+        chunks_per_category = max(1, self.max_map_calls // max(1, len(kategori_yorumlari)))
+        tasks = []
+        for kategori, yorumlar in kategori_yorumlari.items():
+            chunks = self._chunk_reviews(yorumlar)
+            if len(chunks) > chunks_per_category:
+                print(f"{kategori} kategorisinin {len(chunks)} parçasından {chunks_per_category} tanesi özetlenecek.")
+                chunks = [chunks[i * len(chunks) // chunks_per_category] for i in range(chunks_per_category)]
+            tasks.extend((kategori, chunk) for chunk in chunks)
+        kategori_ozetleri = self._summarize_tasks(tasks)
+
+        # Reduce: ara özetler tek bir isteme sığana kadar kategori içinde yeniden özetlenir
+        kategori_ozet_metni = self._join_categories(kategori_ozetleri)
+        while len(kategori_ozet_metni) > self.chunk_chars:
+            tasks = [
+                (kategori, chunk)
+                for kategori, ozetler in kategori_ozetleri.items()
+                for chunk in self._chunk_reviews(ozetler)
+            ]
+            if len(tasks) >= sum(len(ozetler) for ozetler in kategori_ozetleri.values()):
+                # Her kategori tek bir ara özete indi ya da ara özetler parça sınırından uzun
+                break
+            kategori_ozetleri = self._summarize_tasks(tasks, ara_ozet=True)
+            kategori_ozet_metni = self._join_categories(kategori_ozetleri)
+        return kategori_ozet_metni
+
+    def _summarize_map_reduce(self, kategori_yorumlari: dict) -> str:
+        """
+        Her kategori parçasını eşzamanlı olarak özetler, ardından ara özetlerden nihai puanlı sonucu üretir.
+
+        Args:
+            kategori_yorumlari (dict): Kategorilere göre gruplandırılmış yorumları içeren sözlük.
+
+        Returns:
+            str: Tüm yorumların özetlendiği metin.
+        """
+        kategori_ozet_metni = self._map_categories(kategori_yorumlari)
+        return self.ollama_generate(self.build_prompt(kategori_ozet_metni, baslik="Kategori bazında yorum özetleri"))
+
+    def _join_categories(self, kategori_yorumlari: dict) -> str:
+        return "\n".join(
+            [f"{kategori}: " + " | ".join(yorumlar) for kategori, yorumlar in kategori_yorumlari.items()]
+        )
+
+    def _use_map_reduce(self, kategori_yorum_metni: str) -> bool:
+        return self.mode == "map_reduce" or (
+            self.mode == "auto" and len(kategori_yorum_metni) > self.chunk_chars
+        )
+
+    def summary_cache_key(self, kategori_yorumlari: dict) -> str:
+        """
+        Yorum grupları, istem sürümü, özetleme modu ve model adından kararlı bir önbellek anahtarı üretir.
+
+        Args:
+            kategori_yorumlari (dict): Kategorilere göre gruplandırılmış yorumları içeren sözlük.
+
+        Returns:
+            str: Önbellek anahtarı.
+        """
+        fingerprint = json.dumps(
+            {
+                "prompt_version": PROMPT_VERSION,
+                "model": self.model_name,
+                "mode": self.mode,
+                "reviews": kategori_yorumlari
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def get_cached_summary(self, kategori_yorumlari: dict) -> str:
+        """
+        Aynı yorum grupları için daha önce üretilmiş özeti döner.
+
+        Args:
+            kategori_yorumlari (dict): Kategorilere göre gruplandırılmış yorumları içeren sözlük.
+
+        Returns:
+            str: Önbellekteki özet, yoksa None.
+        """
+        if self.summary_cache is None:
+            return None
+        return self.summary_cache.get(self.summary_cache_key(kategori_yorumlari))
+
+    def _store_summary(self, kategori_yorumlari: dict, summary: str) -> None:
+        if self.summary_cache is None or not summary:
+            return
+        self.summary_cache.put(self.summary_cache_key(kategori_yorumlari), summary)
+
+    def save_cache(self) -> None:
+        """
+        Özet önbelleğini (cache_path tanımlıysa) diske yazar. İstek sırasında değil, kapanışta çağrılır.
+        """
+        if self.summary_cache is None:
+            return
+        try:
+            self.summary_cache.save()
+        except OSError as e:
+            print(f"Özet önbelleği diske yazılamadı: {str(e)}")
+
+    def summarize_reviews(self, kategori_yorumlari: dict) -> str:
+        """
+        Verilen yorumları ve kategorileri özetler.
+
+        Args:
+            kategori_yorumlari (dict): Kategorilere göre gruplandırılmış yorumları içeren sözlük.
+
+        Returns:
+            str: Tüm yorumların özetlendiği metin.
+        """
+        summary, _ = self.summarize_reviews_cached(kategori_yorumlari)
+        return summary
+
+    def summarize_reviews_cached(self, kategori_yorumlari: dict) -> tuple:
+        """
+        Verilen yorumları özetler; aynı yorum grupları daha önce özetlendiyse sonucu önbellekten döner.
+
+        Args:
+            kategori_yorumlari (dict): Kategorilere göre gruplandırılmış yorumları içeren sözlük.
+
+        Returns:
+            tuple: (özet metni, önbellekten gelip gelmediği).
+        """
+        cached_summary = self.get_cached_summary(kategori_yorumlari)
+        if self.summary_cache is not None:
+            record_cache("summary", hits=int(cached_summary is not None), misses=int(cached_summary is None))
+        if cached_summary is not None:
+            return cached_summary, True
+
+        kategori_yorum_metni = self._join_categories(kategori_yorumlari)
         try:
-            response = self.ollama_generate(prompt)
-            return response
+            if self._use_map_reduce(kategori_yorum_metni):
+                summary = self._summarize_map_reduce(kategori_yorumlari)
+            else:
+                summary = self.ollama_generate(self.build_prompt(kategori_yorum_metni))
         except Exception as e:
             print(f"Özetleme işlemi sırasında bir hata oluştu: {str(e)}")
-            return ""
+            return "", False
+
+        self._store_summary(kategori_yorumlari, summary)
+        return summary, False
+
+    def summarize_reviews_stream(self, kategori_yorumlari: dict):
+        """
+        Verilen yorumları özetler ve özeti üretildikçe parça parça döner.
+
+        Özet önbellekte varsa tek parça halinde döner. Map-reduce modunda ara özetler tamamlandıktan
+        sonra yalnızca son birleştirme çağrısı akış halinde gelir. Tamamlanan özet önbelleğe yazılır.
+        Özetleme yarıda kesilirse hata çağırana iletilir; o ana kadar gönderilen parçalar tam özet sayılmamalıdır.
+
+        Args:
+            kategori_yorumlari (dict): Kategorilere göre gruplandırılmış yorumları içeren sözlük.
+
+        Yields:
+            str: Özetin bir sonraki metin parçası.
+        """
+        cached_summary = self.get_cached_summary(kategori_yorumlari)
+        if self.summary_cache is not None:
+            record_cache("summary", hits=int(cached_summary is not None), misses=int(cached_summary is None))
+        if cached_summary is not None:
+            yield cached_summary
+            return
+
+        kategori_yorum_metni = self._join_categories(kategori_yorumlari)
+        summary_parts = []
+        if self._use_map_reduce(kategori_yorum_metni):
+            kategori_ozet_metni = self._map_categories(kategori_yorumlari)
+            prompt = self.build_prompt(kategori_ozet_metni, baslik="Kategori bazında yorum özetleri")
+        else:
+            prompt = self.build_prompt(kategori_yorum_metni)
+        for token in self.ollama_generate_stream(prompt):
+            summary_parts.append(token)
+            yield token
+
+        self._store_summary(kategori_yorumlari, "".join(summary_parts).strip())
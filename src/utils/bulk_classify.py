@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.join(current_dir, '..')
+sys.path.append(src_path)
+
+from classification import ReviewClassifier
+
+# Her worker sürecinde bir kez yüklenen sınıflandırıcı
+_worker_classifier = None
+
+
+def _init_worker(model_checkpoint_path: str, threads_per_worker: int, classifier_kwargs: dict) -> None:
+    """
+    Worker sürecini başlatır: torch iş parçacığı sayısını sabitler ve modeli yükler.
+    """
+    global _worker_classifier
+    import torch
+
+    # Worker'lar çekirdekleri paylaşır; her biri yalnızca kendine ayrılan iş parçacıklarını kullanır
+    torch.set_num_threads(threads_per_worker)
+    torch.set_num_interop_threads(1)
+    _worker_classifier = ReviewClassifier(model_checkpoint_path, cache_size=0, **classifier_kwargs)
+
+
+def _classify_chunk(texts: list, first_row: int, part_path: str, threshold: float) -> int:
+    """
+    Bir parçayı sınıflandırır ve sonucu Parquet dosyasına yazar. Dosya önce geçici adla yazılıp sonra
+    yerine taşındığı için yarım kalmış bir parça hiçbir zaman tamamlanmış sayılmaz.
+
+    Returns:
+        int: İşlenen satır sayısı.
+    """
+    probabilities = _worker_classifier.predict_probabilities(texts)
+    result = pd.DataFrame({"row_id": range(first_row, first_row + len(texts)), "text": texts})
+    for index, category in enumerate(_worker_classifier.categories):
+        column = category.replace("/", "_")
+        result[f"prob_{column}"] = probabilities[:, index]
+        result[f"label_{column}"] = probabilities[:, index] >= threshold
+
+    temp_path = f"{part_path}.tmp"
+    result.to_parquet(temp_path, index=False)
+    os.replace(temp_path, part_path)
+    return len(texts)
+
+
+class _ThroughputMeter:
+    """
+    Satır/sn ölçer. Süre ilk parça tamamlandığında başlar; worker'ların başlatılması ve model yükleme süresi
+    verime katılmaz, ilk sonuca kadar geçen süre olarak ayrıca raporlanır.
+    """
+
+    def __init__(self) -> None:
+        self.start_time = time.perf_counter()
+        self.first_result_seconds = None
+        self.processed_rows = 0
+        self._measured_since = None
+        self._last_result = None
+        self._rows_before_measurement = 0
+
+    def add(self, rows: int) -> None:
+        if self._measured_since is None:
+            self._measured_since = time.perf_counter()
+            self.first_result_seconds = self._measured_since - self.start_time
+            self._rows_before_measurement = rows
+            print(f"İlk parça {self.first_result_seconds:.1f} sn'de tamamlandı "
+                  f"(worker başlatma ve model yükleme dahil).")
+        self.processed_rows += rows
+        self._last_result = time.perf_counter()
+
+    def rows_per_sec(self) -> float:
+        if self._last_result is None:
+            return 0.0
+        measured_rows = self.processed_rows - self._rows_before_measurement
+        if measured_rows > 0:
+            return measured_rows / (self._last_result - self._measured_since)
+        # Yalnızca tek parça işlendiyse yükleme süresi dahil edilerek hesaplanır
+        return self.processed_rows / (self._last_result - self.start_time)
+
+
+class BulkClassifier:
+    """
+    BulkClassifier, büyük yorum dosyalarını parça parça okuyup bir süreç havuzunda sınıflandıran ve
+    sonuçları parça başına Parquet dosyalarına yazan bir sınıftır.
+
+    Her parça part-XXXXXX.parquet olarak çıktı klasörüne yazılır. İş yarıda kesilirse aynı komut yeniden
+    çalıştırıldığında tamamlanmış parçalar atlanır.
+
+    Attributes:
+        model_checkpoint_path (str): Eğitilmiş modelin yolu.
+        input_path (str): Girdi dosyası (.csv veya .parquet).
+        output_dir (str): Parquet parçalarının yazılacağı klasör.
+        text_column (str): Yorum metninin bulunduğu sütun.
+        chunk_size (int): Bir parçadaki satır sayısı.
+        num_workers (int): Süreç havuzundaki worker sayısı.
+        threads_per_worker (int): Her worker'ın kullanacağı torch iş parçacığı sayısı.
+        sep (str): CSV ayırıcı karakteri.
+        threshold (float): Etiketler için eşik değeri.
+
+    Methods:
+        run(): Dosyanın tamamını sınıflandırır ve özet istatistikleri döner.
+    """
+
+    def __init__(self, model_checkpoint_path: str, input_path: str, output_dir: str, text_column: str = "YORUM",
+                 chunk_size: int = 10000, num_workers: int = None, threads_per_worker: int = None, sep: str = ",",
+                 threshold: float = 0.5, classifier_kwargs: dict = None) -> None:
+        """
+        Args:
+            model_checkpoint_path (str): Eğitilmiş modelin yolu.
+            input_path (str): Girdi dosyası (.csv veya .parquet).
+            output_dir (str): Parquet parçalarının yazılacağı klasör.
+            text_column (str): Yorum metninin bulunduğu sütun. Varsayılan olarak "YORUM".
+            chunk_size (int): Bir parçadaki satır sayısı. Varsayılan olarak 10000.
+            num_workers (int): Worker sayısı. Verilmezse çekirdek sayısının yarısı kullanılır.
+            threads_per_worker (int): Worker başına torch iş parçacığı sayısı. Verilmezse çekirdekler
+                worker'lar arasında eşit bölünür.
+            sep (str): CSV ayırıcı karakteri. Varsayılan olarak ",".
+            threshold (float): Etiketler için eşik değeri. Varsayılan olarak 0.5.
+            classifier_kwargs (dict): ReviewClassifier'a aktarılacak ek argümanlar (backend, precision vb.).
+        """
+        for name, value in (("chunk_size", chunk_size), ("num_workers", num_workers),
+                            ("threads_per_worker", threads_per_worker)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} pozitif bir tam sayı olmalıdır: {value}")
+        cpu_count = os.cpu_count() or 1
+        self.model_checkpoint_path = model_checkpoint_path
+        self.input_path = input_path
+        self.output_dir = output_dir
+        self.text_column = text_column
+        self.chunk_size = chunk_size
+        self.num_workers = num_workers or max(1, cpu_count // 2)
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.num_workers)
+        self.sep = sep
+        self.threshold = threshold
+        self.classifier_kwargs = classifier_kwargs or {}
+
+    def _iter_chunks(self):
+        """
+        Girdi dosyasını bellekte tamamen tutmadan parça parça okur.
+
+        Yields:
+            list: Bir parçadaki yorum metinleri.
+        """
+        if self.input_path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(self.input_path)
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=[self.text_column]):
+                yield batch.column(0).to_pandas().fillna("").astype(str).tolist()
+        else:
+            reader = pd.read_csv(self.input_path, sep=self.sep, usecols=[self.text_column],
+                                 chunksize=self.chunk_size, encoding="utf-8")
+            for chunk in reader:
+                yield chunk[self.text_column].fillna("").astype(str).tolist()
+
+    def _check_manifest(self) -> None:
+        """
+        Çıktı klasöründeki iş bilgisini kontrol eder. Parça sınırları, model ya da sınıflandırıcı ayarları
+        (backend, precision) değişirse önceki parçalarla karışık sonuç oluşacağı için farklı ayarlarla devam
+        etmeye izin verilmez.
+        """
+        # Verilmeyen backend ve precision için worker'ların kullanacağı ortam değişkeni değerleri kaydedilir
+        classifier_settings = {
+            "backend": os.getenv("CLASSIFIER_BACKEND", "torch"),
+            "precision": os.getenv("CLASSIFIER_PRECISION", "fp32"),
+            **self.classifier_kwargs
+        }
+        manifest = {
+            "input_path": os.path.abspath(self.input_path),
+            "model_checkpoint_path": os.path.abspath(self.model_checkpoint_path),
+            "classifier_kwargs": classifier_settings,
+            "text_column": self.text_column,
+            "chunk_size": self.chunk_size,
+            "threshold": self.threshold
+        }
+        # Karşılaştırma diskteki JSON ile aynı tiplerle yapılsın
+        manifest = json.loads(json.dumps(manifest, ensure_ascii=False, default=str))
+        manifest_path = os.path.join(self.output_dir, "_job.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+            if previous != manifest:
+                raise ValueError(
+                    f"{self.output_dir} farklı ayarlarla başlatılmış bir işe ait. "
+                    f"Önceki ayarlar: {previous}. Lütfen aynı ayarları ya da yeni bir çıktı klasörü kullanın.")
+        else:
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    def run(self) -> dict:
+        """
+        Dosyanın tamamını sınıflandırır. Aynı anda en fazla 2 * num_workers parça bellekte tutulur.
+
+        Returns:
+            dict: İşlenen, atlanan satır sayıları, saniyedeki satır sayısı (model yükleme hariç) ve
+                ilk parçanın tamamlanma süresi.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._check_manifest()
+        print(f"{self.num_workers} worker x {self.threads_per_worker} iş parçacığı ile sınıflandırma başlıyor...")
+
+        skipped_rows = 0
+        meter = _ThroughputMeter()
+        pending = set()
+        executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_checkpoint_path, self.threads_per_worker, self.classifier_kwargs)
+        )
+        try:
+            first_row = 0
+            for chunk_index, texts in enumerate(self._iter_chunks()):
+                part_path = os.path.join(self.output_dir, f"part-{chunk_index:06d}.parquet")
+                if os.path.exists(part_path):
+                    skipped_rows += len(texts)
+                else:
+                    if len(pending) >= 2 * self.num_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            meter.add(future.result())
+                        self._report_progress(meter)
+                    pending.add(executor.submit(_classify_chunk, texts, first_row, part_path, self.threshold))
+                first_row += len(texts)
+
+            for future in as_completed(pending):
+                meter.add(future.result())
+                self._report_progress(meter)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        elapsed = time.perf_counter() - meter.start_time
+        rows_per_sec = meter.rows_per_sec()
+        print(f"Tamamlandı: {meter.processed_rows} satır sınıflandırıldı, {skipped_rows} satır önceki çalışmadan atlandı. "
+              f"({rows_per_sec:.1f} satır/sn, toplam {elapsed:.1f} sn)")
+        return {"processed_rows": meter.processed_rows, "skipped_rows": skipped_rows, "rows_per_sec": rows_per_sec,
+                "first_result_seconds": meter.first_result_seconds}
+
+    def _report_progress(self, meter: _ThroughputMeter) -> None:
+        print(f"{meter.processed_rows} satır sınıflandırıldı ({meter.rows_per_sec():.1f} satır/sn)")
+
+
+def positive_int(value: str) -> int:
+    """
+    argparse için pozitif tam sayı tipi.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tam sayı olmalıdır: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"pozitif olmalıdır: {value}")
+    return number
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Büyük yorum dosyalarını toplu olarak sınıflandırır")
+    parser.add_argument("input_path", help="Girdi dosyası (.csv veya .parquet)")
+    parser.add_argument("output_dir", help="Parquet parçalarının yazılacağı klasör")
+    parser.add_argument("--model", default="src/models/finetuned_class_model", help="Model kontrol noktası yolu")
+    parser.add_argument("--text-column", default="YORUM")
+    parser.add_argument("--sep", default=",", help="CSV ayırıcı karakteri (Trendyol verisi için ';')")
+    parser.add_argument("--chunk-size", type=positive_int, default=10000)
+    parser.add_argument("--workers", type=positive_int, default=None)
+    parser.add_argument("--threads-per-worker", type=positive_int, default=None)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--backend", default=None, help="torch veya onnx")
+    parser.add_argument("--precision", default=None, help="fp32, bf16 veya int8")
+    args = parser.parse_args()
+
+    classifier_kwargs = {key: value for key, value in (("backend", args.backend), ("precision", args.precision)) if value}
+    bulk_classifier = BulkClassifier(
+        model_checkpoint_path=args.model,
+        input_path=args.input_path,
+        output_dir=args.output_dir,
+        text_column=args.text_column,
+        chunk_size=args.chunk_size,
+        num_workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        sep=args.sep,
+        threshold=args.threshold,
+        classifier_kwargs=classifier_kwargs
+    )
+    bulk_classifier.run()
@@ -0,0 +1,70 @@
+import os
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+
+class OnnxExporter:
+    """
+    OnnxExporter, ince ayarlı sınıflandırma modelini ONNX Runtime ile çalıştırılabilecek biçime dönüştüren bir sınıftır.
+
+    Attributes:
+        model_checkpoint_path (str): Dönüştürülecek modelin kontrol noktası yolu.
+        output_path (str): Üretilecek ONNX dosyasının yolu.
+        opset_version (int): Kullanılacak ONNX opset sürümü.
+
+    Methods:
+        export(): Modeli dinamik batch ve dizi uzunluğu ile ONNX formatına aktarır.
+    """
+
+    def __init__(self, model_checkpoint_path: str, output_path: str = None, opset_version: int = 17) -> None:
+        """
+        Args:
+            model_checkpoint_path (str): Dönüştürülecek modelin kontrol noktası yolu.
+            output_path (str): ONNX dosyasının yolu. Verilmezse kontrol noktası klasöründe model.onnx kullanılır.
+            opset_version (int): ONNX opset sürümü. Varsayılan olarak 17.
+        """
+        self.model_checkpoint_path = model_checkpoint_path
+        self.output_path = output_path or os.path.join(model_checkpoint_path, "model.onnx")
+        self.opset_version = opset_version
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_checkpoint_path)
+        self.model = AutoModelForSequenceClassification.from_pretrained(self.model_checkpoint_path)
+        self.model.eval()
+
+    def export(self) -> str:
+        """
+        Modeli ONNX formatına aktarır.
+
+        Returns:
+            str: Üretilen ONNX dosyasının yolu.
+        """
+        sample = self.tokenizer(
+            ["Ürün çok güzel, kargo hızlı geldi.", "Fiyatına göre iyi"],
+            truncation=True,
+            padding=True,
+            max_length=128,
+            return_tensors="pt"
+        )
+        # BERT forward imzasındaki sırayla konumsal girdiler
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        with torch.no_grad():
+            torch.onnx.export(
+                self.model,
+                tuple(sample[name] for name in input_names),
+                self.output_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=self.opset_version,
+                dynamo=False
+            )
+        print(f"Model ONNX formatında {self.output_path} konumuna kaydedildi.")
+        return self.output_path
+
+
+if __name__ == "__main__":
+    model_checkpoint_path = "src/models/finetuned_class_model"
+    exporter = OnnxExporter(model_checkpoint_path=model_checkpoint_path)
+    exporter.export()
@@ -0,0 +1,266 @@
+"""
+Çevrimdışı Performans Ölçümü
+
+Sınıflandırma, RapidAPI sayfalama ve özetleme yollarını ağ erişimi, RapidAPI anahtarı, eğitilmiş model ya da
+Ollama kurulumu olmadan ölçer; sonuçları commit'ler arasında karşılaştırılabilecek JSON olarak yazar.
+
+Kullanım:
+    python tests/benchmark.py --output benchmark_results.json
+    python tests/benchmark.py --baseline benchmark_results.json --tolerance 0.15
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.join(current_dir, '..', 'src')
+sys.path.append(src_path)
+
+from rapidapi_mock_server import RapidAPIMockServer
+from ollama_stub_server import OllamaStubServer
+
+TOKENIZER_PATH = os.path.join(src_path, "models", "finetuned_class_model")
+WORDS = [
+    "ürün", "kalite", "kargo", "hızlı", "geldi", "paketleme", "özenli", "fiyat", "performans", "tasarım",
+    "şık", "beden", "dar", "kumaş", "güzel", "tavsiye", "ederim", "iade", "ettim", "renk", "farklı",
+    "sağlam", "kırık", "geç", "teslim", "uygun", "pahalı", "memnun", "kaldım", "çok"
+]
+
+# Sonuçlardaki her metriğin hangi yönde iyileştiği (karşılaştırma için)
+HIGHER_IS_BETTER = ("reviews_per_sec", "pages_per_sec", "tokens_per_sec")
+LOWER_IS_BETTER = ("seconds", "time_to_first_token")
+
+
+def make_texts(count: int, words_per_text: int, seed: int = 42) -> list:
+    """
+    Sabit tohumla, verilen uzunlukta rastgele Türkçe yorum metinleri üretir.
+    """
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words_per_text)) for _ in range(count)]
+
+
+def build_tiny_model(output_dir: str) -> str:
+    """
+    Reponun tokenizer'ı ile küçük, rastgele başlatılmış bir BERT sınıflandırma modeli oluşturur.
+    Ağırlıklar anlamsızdır; yalnızca sınıflandırma yolunun hızı ölçülür.
+
+    Returns:
+        str: Modelin kaydedildiği klasör.
+    """
+    import torch
+    from transformers import AutoTokenizer, BertConfig, BertForSequenceClassification
+
+    torch.manual_seed(0)
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_PATH)
+    config = BertConfig(
+        vocab_size=len(tokenizer),
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        intermediate_size=128,
+        max_position_embeddings=512,
+        num_labels=4,
+        problem_type="multi_label_classification"
+    )
+    BertForSequenceClassification(config).save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    return output_dir
+
+
+def timed(fn, repeats: int) -> float:
+    """
+    Fonksiyonu repeats kez çalıştırır ve ortanca süreyi (saniye) döner.
+    """
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+class Benchmark:
+    """
+    Benchmark, reponun sıcak yollarını çevrimdışı ölçen bir sınıftır.
+
+    Attributes:
+        repeats (int): Her ölçümün tekrar sayısı (ortanca alınır).
+        results (dict): Ölçüm sonuçları.
+
+    Methods:
+        bench_classifier(): Sınıflandırıcı hızını batch boyutu ve metin uzunluğuna göre ölçer.
+        bench_amazon_api(): Sayfalamanın sıralı ve eşzamanlı hızını ölçer.
+        bench_summarizer(): Özetleme süresini ve ilk token süresini ölçer.
+        run(): Tüm ölçümleri çalıştırır ve sonuçları döner.
+    """
+
+    def __init__(self, repeats: int = 3) -> None:
+        self.repeats = repeats
+        self.results = {}
+
+    def bench_classifier(self, batch_sizes=(8, 32, 64), words_per_text=(8, 40, 120), num_texts: int = 256) -> dict:
+        from classification import ReviewClassifier
+
+        results = {}
+        with tempfile.TemporaryDirectory() as model_dir:
+            build_tiny_model(model_dir)
+            for batch_size in batch_sizes:
+                classifier = ReviewClassifier(model_dir, batch_size=batch_size, cache_size=0)
+                for words in words_per_text:
+                    texts = make_texts(num_texts, words)
+                    classifier.predict_probabilities(texts[:batch_size])  # ısınma
+                    seconds = timed(lambda: classifier.predict_probabilities(texts), self.repeats)
+                    results[f"batch_{batch_size}/words_{words}"] = {
+                        "seconds": round(seconds, 4),
+                        "reviews_per_sec": round(num_texts / seconds, 1)
+                    }
+        self.results["classifier"] = results
+        return results
+
+    def bench_amazon_api(self, total_reviews: int = 200, page_delay: float = 0.02) -> dict:
+        os.environ.setdefault("RAPIDAPI_KEY", "benchmark")
+        # Sayfalama hızı ölçülür; hız sınırlayıcı mock sunucunun sınırsız kotasında devreye girmesin
+        os.environ.setdefault("RAPIDAPI_MAX_RPS", "1000")
+        server = RapidAPIMockServer(port=0, total_reviews=total_reviews, page_delay=page_delay).start()
+        os.environ["RAPIDAPI_BASE_URL"] = server.base_url
+        try:
+            from amazon_api import AmazonAPI
+
+            amazon_api = AmazonAPI()
+            pages = amazon_api.calculate_page_count(total_reviews)
+            results = {}
+            for name, concurrent in (("sequential", False), ("concurrent", True)):
+                seconds = timed(lambda: amazon_api.get_amazon_reviews("B0BENCHMRK", concurrent=concurrent), self.repeats)
+                results[name] = {"seconds": round(seconds, 4), "pages_per_sec": round(pages / seconds, 1)}
+        finally:
+            server.stop()
+            del os.environ["RAPIDAPI_BASE_URL"]
+        self.results["amazon_api"] = results
+        return results
+
+    def bench_summarizer(self, token_delay: float = 0.002, reviews_per_category: int = 200) -> dict:
+        from summarization import ReviewSummarizer, OllamaClient
+
+        server = OllamaStubServer(port=0, token_delay=token_delay).start()
+        try:
+            client = OllamaClient(base_url=server.base_url)
+            kategori_yorumlari = {
+                category: make_texts(reviews_per_category, 20, seed=index)
+                for index, category in enumerate(["URUN_KALITESI", "PAKETLEME/TESLIMAT", "FIYAT/PERFORMANS"])
+            }
+            results = {}
+            for mode in ("single", "map_reduce"):
+                summarizer = ReviewSummarizer(mode=mode, cache_size=0, client=client)
+                seconds = timed(lambda: summarizer.summarize_reviews(kategori_yorumlari), self.repeats)
+                results[mode] = {"seconds": round(seconds, 4)}
+
+            summarizer = ReviewSummarizer(mode="single", cache_size=0, client=client)
+
+            def first_token():
+                stream = summarizer.summarize_reviews_stream(kategori_yorumlari)
+                next(stream)
+                stream.close()
+
+            results["stream"] = {"time_to_first_token": round(timed(first_token, self.repeats), 4)}
+        finally:
+            server.stop()
+        self.results["summarizer"] = results
+        return results
+
+    def run(self) -> dict:
+        self.bench_classifier()
+        self.bench_amazon_api()
+        self.bench_summarizer()
+        return {"meta": environment_info(), "results": self.results}
+
+
+def environment_info() -> dict:
+    """
+    Sonuçların hangi commit ve ortamda üretildiğini döner.
+    """
+    import torch
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=current_dir).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "commit": commit or None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads()
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        else:
+            flat[name] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Güncel sonuçları önceki bir çalıştırmayla karşılaştırır.
+
+    Args:
+        current (dict): Güncel sonuçlar.
+        baseline (dict): Önceki sonuçlar.
+        tolerance (float): İzin verilen en büyük göreli kötüleşme (0.15 = %15).
+
+    Returns:
+        list: Kötüleşen metriklerin açıklamaları.
+    """
+    regressions = []
+    current_flat = flatten(current["results"])
+    for name, old in flatten(baseline["results"]).items():
+        new = current_flat.get(name)
+        if new is None or not old:
+            continue
+        change = (new - old) / old
+        metric = name.rsplit("/", 1)[-1]
+        if (metric in HIGHER_IS_BETTER and change < -tolerance) or (metric in LOWER_IS_BETTER and change > tolerance):
+            regressions.append(f"{name}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Çevrimdışı performans ölçümü")
+    parser.add_argument("--output", default=None, help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="İzin verilen göreli kötüleşme")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    report = Benchmark(repeats=args.repeats).run()
+    report_json = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report_json)
+        print(f"Sonuçlar {args.output} dosyasına yazıldı.")
+    else:
+        print(report_json)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Performans kötüleşmesi tespit edildi:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Önceki sonuçlara göre kötüleşme yok.")
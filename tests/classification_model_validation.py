@@ -1,9 +1,18 @@
+import os
+import sys
+import time
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 import pandas as pd
 import numpy as np
 
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.join(current_dir, '..', 'src')
+sys.path.append(src_path)
+
+from classification import ReviewClassifier
+
 
 class ModelValidator:
     """
@@ -22,6 +31,7 @@ class ModelValidator:
         predict(): Model ile tahmin yapar.
         compute_metrics(): Performans metriklerini hesaplar.
         validate(): Modeli doğrular ve sonuçları döndürür.
+        compare_precisions(modes): Aynı doğrulama setini farklı precision modlarında çalıştırıp karşılaştırır.
     """
 
     def __init__(self, model_checkpoint_path: str, val_data_path: str) -> None:
@@ -140,10 +150,52 @@ class ModelValidator:
             else:
                 print(f"{key}: {value:.4f}")
 
+    def compare_precisions(self, modes: tuple = ("fp32", "bf16", "int8")) -> dict:
+        """
+        Doğrulama setini ReviewClassifier üzerinden her precision modunda çalıştırır; kategori bazlı F1
+        değerlerini ilk moda (referans) göre farklarıyla ve ölçülen çıkarım hızıyla yan yana yazdırır.
+
+        Args:
+            modes (tuple): Karşılaştırılacak precision modları. İlk mod referans kabul edilir.
+
+        Returns:
+            dict: Her mod için metrikler ve saniyedeki yorum sayısı.
+        """
+        if self.val_data is None:
+            self.load_data()
+
+        texts = self.val_data["text"].astype(str).tolist()
+        results = {}
+        for mode in modes:
+            classifier = ReviewClassifier(self.model_checkpoint_path, precision=mode, cache_size=0)
+            classifier.predict_probabilities(texts[:classifier.batch_size])  # ısınma
+            start_time = time.perf_counter()
+            self.predictions = classifier.predict_probabilities(texts)
+            elapsed = time.perf_counter() - start_time
+            metrics = self.compute_metrics()
+            metrics['reviews_per_second'] = len(texts) / elapsed
+            results[mode] = metrics
+
+        reference = results[modes[0]]
+        category_names = list(reference['category_metrics'].keys())
+        print(f"Precision karşılaştırması (referans: {modes[0]})")
+        print(f"{'Mod':<6} {'yorum/sn':>10} {'F1':>8} {'ΔF1':>8}  " +
+              "  ".join(f"{category:>20}" for category in category_names))
+        for mode, metrics in results.items():
+            category_cells = []
+            for category in category_names:
+                f1 = metrics['category_metrics'][category]['f1']
+                delta = f1 - reference['category_metrics'][category]['f1']
+                category_cells.append(f"{f1:>11.4f} ({delta:+.4f})")
+            print(f"{mode:<6} {metrics['reviews_per_second']:>10.1f} {metrics['f1']:>8.4f} "
+                  f"{metrics['f1'] - reference['f1']:>+8.4f}  " + "  ".join(category_cells))
+        return results
+
 
 # Kullanım örneği
 if __name__ == "__main__":
     model_checkpoint_path = "src/models/finetuned_class_model"
     val_data_path = "dataset/validation_df(random_state_42).csv"
     validator = ModelValidator(model_checkpoint_path=model_checkpoint_path, val_data_path=val_data_path)
-    validator.validate()
\ No newline at end of file
+    validator.validate()
+    validator.compare_precisions()
@@ -0,0 +1,184 @@
+"""
+Ollama Stub Server
+
+Özetleme yolunu gerçek bir Ollama/llama3 kurulumu olmadan (çevrimdışı) yük testine tabi tutmak için
+/api/generate uç noktasını taklit eden küçük bir HTTP sunucusu.
+
+Kullanım:
+    python tests/ollama_stub_server.py --port 11434 --token-delay 0.02 --load-delay 3
+    OLLAMA_HOST=http://127.0.0.1:11434 uvicorn app:app --port 4000
+"""
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_RESPONSE = """Yorumların Puanları:
+1. Ürün Kalitesi: 8/10
+2. Paketleme/Teslimat: 7/10
+3. Ürün Tasarımı: 8/10
+4. Fiyat/Performans: 9/10
+5. Genel Sonuç: 8/10
+
+Yorum Özetleri:
+1. Ürün Kalitesi: Kullanıcılar ürünün kalitesinden genel olarak memnun.
+2. Paketleme/Teslimat: Teslimat çoğunlukla zamanında, paketleme yeterli.
+3. Ürün Tasarımı: Tasarım beğenilmiş, bazı beden sorunları belirtilmiş.
+4. Fiyat/Performans: Fiyatına göre başarılı bulunmuş.
+5. Genel Sonuç: Ürün tavsiye ediliyor."""
+
+
+def parse_keep_alive(keep_alive) -> float:
+    """
+    Ollama keep_alive değerini ("30m", "10s", "1h", 300, "-1") saniyeye çevirir. Negatif değer süresiz demektir.
+    """
+    if keep_alive is None:
+        return 300.0
+    if isinstance(keep_alive, (int, float)):
+        return float("inf") if keep_alive < 0 else float(keep_alive)
+    match = re.fullmatch(r"(-?\d+(?:\.\d+)?)([smh]?)", str(keep_alive).strip())
+    if not match:
+        return 300.0
+    value = float(match.group(1))
+    if value < 0:
+        return float("inf")
+    return value * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+class OllamaStubServer:
+    """
+    OllamaStubServer, Ollama'nın /api/generate uç noktasını taklit eden bir test sunucusudur.
+
+    Model, keep_alive süresi dolduktan sonraki ilk istekte load_delay kadar "yüklenir"; böylece
+    keep_alive ayarının soğuk yükleme maliyetine etkisi çevrimdışı ölçülebilir.
+
+    Attributes:
+        port (int): Dinlenecek port (0 verilirse boş bir port seçilir).
+        token_delay (float): Her parça arasındaki bekleme süresi (saniye).
+        load_delay (float): Soğuk model yükleme süresi (saniye).
+        response_text (str): Her isteğe döndürülecek yanıt metni.
+        request_count (int): Alınan /api/generate isteği sayısı.
+        cold_loads (int): Gerçekleşen soğuk yükleme sayısı.
+
+    Methods:
+        start(): Sunucuyu arka planda başlatır.
+        stop(): Sunucuyu durdurur.
+        serve_forever(): Sunucuyu ön planda çalıştırır.
+    """
+
+    def __init__(self, port: int = 11434, token_delay: float = 0.0, load_delay: float = 0.0,
+                 response_text: str = DEFAULT_RESPONSE) -> None:
+        self.token_delay = token_delay
+        self.load_delay = load_delay
+        self.response_text = response_text
+        self.request_count = 0
+        self.cold_loads = 0
+        self._loaded_until = 0.0
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self.port = self.httpd.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def _ensure_loaded(self, keep_alive) -> None:
+        with self._lock:
+            now = time.time()
+            cold = now >= self._loaded_until
+            if cold:
+                self.cold_loads += 1
+        if cold and self.load_delay:
+            time.sleep(self.load_delay)
+        with self._lock:
+            self._loaded_until = time.time() + parse_keep_alive(keep_alive)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{"name": "llama3:latest"}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    self._send_json(404, {"error": "not found"})
+                    return
+
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.request_count += 1
+                server._ensure_loaded(payload.get("keep_alive"))
+
+                model = payload.get("model", "llama3")
+                if not payload.get("prompt"):
+                    # İstemsiz istek yalnızca modeli yükler
+                    self._send_json(200, {"model": model, "response": "", "done": True})
+                    return
+
+                tokens = re.findall(r"\S+\s*", server.response_text)
+                if not payload.get("stream", True):
+                    time.sleep(server.token_delay * len(tokens))
+                    self._send_json(200, {"model": model, "response": server.response_text, "done": True})
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for token in tokens + [None]:
+                        if token is not None and server.token_delay:
+                            time.sleep(server.token_delay)
+                        chunk = {"model": model, "response": token or "", "done": token is None}
+                        data = (json.dumps(chunk, ensure_ascii=False) + "\n").encode("utf-8")
+                        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # İstemci akışı yarıda bıraktı
+                    self.close_connection = True
+
+        return Handler
+
+    def start(self) -> "OllamaStubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def serve_forever(self) -> None:
+        print(f"Ollama stub sunucusu {self.base_url} adresinde çalışıyor.")
+        self.httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Çevrimdışı testler için Ollama stub sunucusu")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Parçalar arası bekleme (saniye)")
+    parser.add_argument("--load-delay", type=float, default=0.0, help="Soğuk model yükleme süresi (saniye)")
+    args = parser.parse_args()
+    OllamaStubServer(port=args.port, token_delay=args.token_delay, load_delay=args.load_delay).serve_forever()
@@ -0,0 +1,71 @@
+import os
+import sys
+import pandas as pd
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.join(current_dir, '..', 'src')
+sys.path.append(src_path)
+
+from classification import ReviewClassifier
+
+
+class OnnxParityChecker:
+    """
+    OnnxParityChecker, ONNX backend'inin torch backend'i ile aynı sonuçları verdiğini doğrulayan bir sınıftır.
+
+    Attributes:
+        model_checkpoint_path (str): Eğitilmiş modelin yolu (model.onnx aynı klasörde olmalıdır).
+        val_data_path (str): Doğrulama veri setinin yolu.
+        atol (float): Olasılıklar arasında izin verilen en büyük mutlak fark.
+
+    Methods:
+        check(): İki backend'in olasılıklarını ve eşiklenmiş etiketlerini karşılaştırır.
+    """
+
+    def __init__(self, model_checkpoint_path: str, val_data_path: str, atol: float = 1e-4) -> None:
+        """
+        Args:
+            model_checkpoint_path (str): Eğitilmiş modelin yolu.
+            val_data_path (str): Doğrulama veri setinin yolu.
+            atol (float): İzin verilen en büyük mutlak fark. Varsayılan olarak 1e-4.
+        """
+        self.model_checkpoint_path = model_checkpoint_path
+        self.val_data_path = val_data_path
+        self.atol = atol
+
+    def check(self, threshold: float = 0.5) -> dict:
+        """
+        Doğrulama metinlerini iki backend ile sınıflandırır ve farkları raporlar.
+
+        Args:
+            threshold (float): Etiketlerin karşılaştırılacağı eşik değeri. Varsayılan olarak 0.5.
+
+        Returns:
+            dict: En büyük mutlak fark, farklı etiket sayısı ve kontrolün geçip geçmediği.
+        """
+        texts = pd.read_csv(self.val_data_path)["text"].astype(str).tolist()
+
+        torch_classifier = ReviewClassifier(self.model_checkpoint_path, backend="torch", cache_size=0)
+        onnx_classifier = ReviewClassifier(self.model_checkpoint_path, backend="onnx", cache_size=0)
+        torch_probabilities = torch_classifier.predict_probabilities(texts)
+        onnx_probabilities = onnx_classifier.predict_probabilities(texts)
+
+        max_abs_diff = float(np.abs(torch_probabilities - onnx_probabilities).max())
+        label_mismatches = int(((torch_probabilities >= threshold) != (onnx_probabilities >= threshold)).sum())
+        passed = max_abs_diff <= self.atol and label_mismatches == 0
+
+        print(f"Örnek sayısı: {len(texts)}")
+        print(f"En büyük mutlak olasılık farkı: {max_abs_diff:.2e}")
+        print(f"Farklı etiket sayısı: {label_mismatches}")
+        print("Parite kontrolü başarılı." if passed else "Parite kontrolü BAŞARISIZ.")
+        return {"max_abs_diff": max_abs_diff, "label_mismatches": label_mismatches, "passed": passed}
+
+
+# Kullanım örneği
+if __name__ == "__main__":
+    model_checkpoint_path = "src/models/finetuned_class_model"
+    val_data_path = "dataset/validation_df(random_state_42).csv"
+    checker = OnnxParityChecker(model_checkpoint_path=model_checkpoint_path, val_data_path=val_data_path)
+    result = checker.check()
+    sys.exit(0 if result["passed"] else 1)
@@ -0,0 +1,209 @@
+"""
+RapidAPI Mock Server
+
+AmazonAPI'nin sayfalama ve önbellek yollarını gerçek RapidAPI anahtarı olmadan (çevrimdışı) test etmek için
+/product-reviews uç noktasını taklit eden küçük bir HTTP sunucusu.
+
+Kullanım:
+    python tests/rapidapi_mock_server.py --port 8010 --total-reviews 250 --page-delay 0.2
+    python tests/rapidapi_mock_server.py --rate-limit 5 --error-rate 0.1   # kota aşımı (429) ve 5xx benzetimi
+    RAPIDAPI_BASE_URL=http://127.0.0.1:8010 RAPIDAPI_KEY=test uvicorn app:app --port 4000
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_COMMENTS = [
+    "Ürün çok kaliteli, kumaşı güzel",
+    "Kargo çok hızlı geldi, paketleme özenliydi",
+    "Fiyatına göre gayet başarılı bir ürün",
+    "Tasarımı şık ama bedeni biraz dar",
+    "Paket ezik geldi, ürün sağlam çıktı",
+    "Fiyat performans ürünü, tavsiye ederim",
+    "Rengi fotoğraftaki gibi değil",
+    "İki yıkamada tüylendi, kalitesi düşük"
+]
+
+
+class RapidAPIMockServer:
+    """
+    RapidAPIMockServer, real-time-amazon-data /product-reviews uç noktasını taklit eden bir test sunucusudur.
+
+    Her ASIN için total_reviews adet kararlı (deterministik) yorum üretir; TOP_REVIEWS ve MOST_RECENT
+    sıralamalarını destekler.
+
+    rate_limit verilirse saniyede bundan fazla gelen istekler RapidAPI gibi 429 ve Retry-After ile reddedilir;
+    quota verilirse her yanıtta x-ratelimit-requests-* başlıkları döner ve kota bitince 429 verilir.
+    error_rate oranındaki istekler 503 ile yanıtlanır.
+
+    Attributes:
+        port (int): Dinlenecek port (0 verilirse boş bir port seçilir).
+        total_reviews (int): Her ürün için toplam yorum sayısı.
+        page_delay (float): Her sayfa isteğinin yanıt süresi (saniye).
+        rate_limit (float): Saniyede kabul edilecek en fazla istek (opsiyonel).
+        quota (int): Toplam istek kotası (opsiyonel).
+        error_rate (float): 503 ile yanıtlanacak isteklerin oranı.
+        request_count (int): Alınan /product-reviews isteği sayısı.
+        throttled_count (int): 429 ile reddedilen istek sayısı.
+        error_count (int): 503 ile yanıtlanan istek sayısı.
+
+    Methods:
+        start(): Sunucuyu arka planda başlatır.
+        stop(): Sunucuyu durdurur.
+        serve_forever(): Sunucuyu ön planda çalıştırır.
+    """
+
+    def __init__(self, port: int = 8010, total_reviews: int = 100, page_delay: float = 0.0, rate_limit: float = None,
+                 quota: int = None, error_rate: float = 0.0, seed: int = 0) -> None:
+        self.total_reviews = total_reviews
+        self.rate_limit = rate_limit
+        self.quota = quota
+        self.error_rate = error_rate
+        self.throttled_count = 0
+        self.error_count = 0
+        self._accepted = []  # son bir saniyede kabul edilen isteklerin zamanları
+        self._random = random.Random(seed)
+        self.page_delay = page_delay
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self.port = self.httpd.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def build_page(self, asin: str, page: int, sort_by: str, star_rating: str = "ALL") -> dict:
+        """
+        İstenen sayfanın RapidAPI biçimindeki yanıtını üretir. En yeni yorumun kimliği en büyük sayıdır;
+        i numaralı yorumun yıldız puanı 1 + i % 5'tir.
+        """
+        ids = list(range(self.total_reviews))
+        if star_rating != "ALL":
+            stars = int(star_rating.split("_")[0])
+            ids = [i for i in ids if 1 + i % 5 == stars]
+        if sort_by == "MOST_RECENT":
+            ids.reverse()
+        reviews = [
+            {
+                "review_id": f"{asin}-R{i:06d}",
+                "review_comment": f"{SAMPLE_COMMENTS[i % len(SAMPLE_COMMENTS)]} ({i})",
+                "review_star_rating": str(1 + i % 5),
+                "review_date": f"Reviewed in Turkey on day {i}"
+            }
+            for i in ids[(page - 1) * 10:page * 10]
+        ]
+        return {
+            "status": "OK",
+            "parameters": {"asin": asin, "page": page, "sort_by": sort_by, "star_rating": star_rating},
+            "data": {"asin": asin, "total_reviews": len(ids), "reviews": reviews}
+        }
+
+    def admit(self) -> tuple:
+        """
+        İsteğin kabul edilip edilmeyeceğine karar verir.
+
+        Returns:
+            tuple: (durum kodu, ek başlıklar). Durum kodu 200, 429 ya da 503 olur.
+        """
+        with self._lock:
+            self.request_count += 1
+            headers = {}
+            if self.quota is not None:
+                remaining = self.quota - (self.request_count - self.throttled_count)
+                headers.update({
+                    "x-ratelimit-requests-limit": str(self.quota),
+                    "x-ratelimit-requests-remaining": str(max(0, remaining)),
+                    "x-ratelimit-requests-reset": "3600"
+                })
+                if remaining < 0:
+                    self.throttled_count += 1
+                    return 429, headers
+
+            if self.rate_limit:
+                now = time.monotonic()
+                self._accepted = [t for t in self._accepted if now - t < 1.0]
+                if len(self._accepted) >= self.rate_limit:
+                    self.throttled_count += 1
+                    retry_after = 1.0 - (now - self._accepted[0])
+                    headers["Retry-After"] = f"{retry_after:.3f}"
+                    return 429, headers
+                self._accepted.append(now)
+
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.error_count += 1
+                return 503, headers
+            return 200, headers
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict, headers: dict = None) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path != "/product-reviews":
+                    self._send_json(404, {"message": "not found"})
+                    return
+
+                params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                status, headers = server.admit()
+                if status == 429:
+                    self._send_json(429, {"message": "Too many requests"}, headers)
+                    return
+                if server.page_delay:
+                    time.sleep(server.page_delay)
+                if status == 503:
+                    self._send_json(503, {"message": "Service unavailable"}, headers)
+                    return
+                page = int(params.get("page", "1"))
+                self._send_json(200, server.build_page(params.get("asin", ""), page,
+                                                       params.get("sort_by", "TOP_REVIEWS"),
+                                                       params.get("star_rating", "ALL")), headers)
+
+        return Handler
+
+    def start(self) -> "RapidAPIMockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def serve_forever(self) -> None:
+        print(f"RapidAPI mock sunucusu {self.base_url} adresinde çalışıyor.")
+        self.httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Çevrimdışı testler için RapidAPI mock sunucusu")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--total-reviews", type=int, default=100, help="Ürün başına toplam yorum sayısı")
+    parser.add_argument("--page-delay", type=float, default=0.0, help="Sayfa başına yanıt süresi (saniye)")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Saniyede kabul edilecek en fazla istek")
+    parser.add_argument("--quota", type=int, default=None, help="Toplam istek kotası")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 ile yanıtlanacak isteklerin oranı")
+    args = parser.parse_args()
+    RapidAPIMockServer(port=args.port, total_reviews=args.total_reviews, page_delay=args.page_delay,
+                       rate_limit=args.rate_limit, quota=args.quota, error_rate=args.error_rate).serve_forever()